@@ -0,0 +1,27 @@
+from typing import List, Optional
+import os
+
+import numpy as np
+
+
+def save_array(path: str, array: np.ndarray):
+    """
+    Store 'array' as a .npy file at 'path' (the directory is created if needed). The array is written to a temporary
+    file first, which then replaces the file at 'path' at once, so that other processes never read a partly written
+    file.
+    """
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'wb') as fh:
+        np.save(fh, np.ascontiguousarray(array))
+    os.replace(tmp_path, path)
+
+
+def load_arrays(paths: List[str]) -> Optional[List[np.ndarray]]:
+    """
+    Load the arrays stored with save_array(...) at 'paths', memory-mapped (read-only), so that processes loading the
+    same file share the same memory pages. Return None if any of the files does not exist.
+    """
+    if not all(os.path.exists(path) for path in paths):
+        return None
+    return [np.load(path, mmap_mode='r') for path in paths]
@@ -5,6 +5,11 @@ from .main_components import Orientation
 from .main_components import Dimensions
 from .main_components import SolarPanel
 from .main_components import SolarPanelMatrix
+from .main_components import PanelTypeRegistry
+from .main_components import get_unique_panel_types
+from .main_components import evaluate_panel_types
+from .main_components import calculate_irradiances
+from .main_components import evaluate_orientation_grid
 from .main_components import Inverter
 
 from .auxiliary_components import Battery
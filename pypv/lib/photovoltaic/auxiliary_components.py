@@ -189,15 +189,27 @@ class SolarCable:
         """
         Calculate voltage drop across cable for a given string current 'I_mpp'.
         """
-        rho = self._rho_al if self._conductor_material == 'Al' else self._rho_cu
-        self.voltage_loss = rho * 2 * self.length / self._cross_section * Impp
+        self.voltage_loss = self.calc_voltage_drop(Impp)
 
     def get_power_loss(self, Impp: float):
         """
         Calculate power loss across cable for a given string current 'I_mpp'.
         """
+        self.power_loss = self.calc_power_loss(Impp)
+
+    def calc_voltage_drop(self, Impp: float) -> float:
+        """
+        Return voltage drop across cable for a given string current 'I_mpp' without storing it in the cable.
+        """
         rho = self._rho_al if self._conductor_material == 'Al' else self._rho_cu
-        self.power_loss = rho * 2 * self.length * Impp ** 2 / self._cross_section
+        return rho * 2 * self.length / self._cross_section * Impp
+
+    def calc_power_loss(self, Impp: float) -> float:
+        """
+        Return power loss across cable for a given string current 'I_mpp' without storing it in the cable.
+        """
+        rho = self._rho_al if self._conductor_material == 'Al' else self._rho_cu
+        return rho * 2 * self.length * Impp ** 2 / self._cross_section
 
 ########################################################################################################################
 
@@ -255,18 +267,37 @@ class StringCables(List[SolarCable]):
             )
         return [self[i].min_cross_section for i in range(len(self))]
 
+    def _get_string_current(self) -> float:
+        # MPP current of one string at the operating conditions last set with
+        # SolarPanelMatrix.set_operating_conditions(...)
+        return self._pv_matrix.get_mpp_current() / self._pv_matrix.col_num
+
     def get_voltage_drop(self):
-        solar_panel = self._pv_matrix.matrix[0][0]
+        Impp = self._get_string_current()
         for cable in self:
-            cable.get_voltage_drop(Impp=solar_panel.pv_char.awc.Impp)
+            cable.get_voltage_drop(Impp=Impp)
         return np.mean([cable.voltage_loss for cable in self])
 
     def get_power_loss(self):
-        solar_panel = self._pv_matrix.matrix[0][0]
+        Impp = self._get_string_current()
         for cable in self:
-            cable.get_power_loss(Impp=solar_panel.pv_char.awc.Impp)
+            cable.get_power_loss(Impp=Impp)
         return sum([cable.power_loss for cable in self])
 
+    def calc_voltage_drop(self, Impp: float) -> float:
+        """
+        Return mean voltage drop across the string cables for a given string current 'Impp'. Unlike
+        get_voltage_drop() the cables are left untouched.
+        """
+        return np.mean([cable.calc_voltage_drop(Impp) for cable in self])
+
+    def calc_power_loss(self, Impp: float) -> float:
+        """
+        Return total power loss across the string cables for a given string current 'Impp'. Unlike
+        get_power_loss() the cables are left untouched.
+        """
+        return sum([cable.calc_power_loss(Impp) for cable in self])
+
     def set_cable_lengths(self, *string_lengths):
         if len(string_lengths) == len(self):
             for cable, length in zip(self, string_lengths):
@@ -1,104 +1,199 @@
-import csv
-import math
+from typing import List, Optional
+import hashlib
+import os
 
-from quantities.date_time import DateTime, ANY_YEAR
+import numpy as np
+import pandas as pd
+
+from array_store import save_array, load_arrays
+from quantities.date_time import DateTime, Date, Time, ANY_YEAR, convert_to_lt_array
 
 
 class _CSVDataFetcher:
-    """Base class for reading and preparing data from .csv-files."""
+    """
+    Base class for reading and preparing data from .csv-files. The first column of the file contains the date-times
+    (in UTC), the next columns contain the values. The file is parsed column by column: the date-times into a NumPy
+    datetime64 array and the values into a 2D float array. These columns replace the table of rows that was parsed
+    row by row with csv.reader before; for compatibility that table can still be built from them (see property
+    'table').
+    """
+    # optional cache of parsed files (see enable_cache(...))
+    _cache_dir: Optional[str] = None
+
     def __init__(self, file_path, datetime_fmt='%d/%m/%Y %H:%M:%S', tz_str='UTC'):
         self.datetime_fmt = datetime_fmt
         self.tz_str = tz_str
-        self._read_table(file_path)
-        self._remove_header()
-        self._format_table()
+        if not self._load_cached(file_path):
+            self._read_table(file_path)
+            self._format_table()
+            self._save_cached()
         self._split_table()
         self._transform_datasets()
 
-    def _read_table(self, file_path):
-        self.table = []
-        with open(file_path, newline='') as csv_file:
-            reader = csv.reader(csv_file, quotechar='"')
-            for row in reader:
-                self.table.append(row)
+    @staticmethod
+    def enable_cache(directory: str):
+        """
+        Store the parsed and time zone converted columns of each file as binary files in 'directory'. When the same
+        file is read again (with the same date-time format and time zone), the columns are memory-mapped from the
+        cache instead of parsing the file, so that processes reading the same file also share the same memory pages.
+        """
+        _CSVDataFetcher._cache_dir = directory
+
+    @staticmethod
+    def disable_cache():
+        _CSVDataFetcher._cache_dir = None
+
+    def _get_cache_key(self, file_path):
+        # the key depends on the content of the file, on how it is parsed and on the year the data is moved to
+        file_hash = hashlib.sha1()
+        with open(file_path, 'rb') as fh:
+            for chunk in iter(lambda: fh.read(1 << 20), b''):
+                file_hash.update(chunk)
+        key = repr((file_hash.hexdigest(), self.datetime_fmt, self.tz_str, ANY_YEAR))
+        return 'csvdata_' + hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
 
-    def _remove_header(self):
-        # remove first row from the table (= table header)
-        self.table.pop(0)
+    def _get_cache_paths(self):
+        return [os.path.join(self._cache_dir, f'{self._cache_key}_{name}.npy') for name in ('datetimes', 'values')]
+
+    def _load_cached(self, file_path):
+        # memory-map the parsed columns from the cache; return False if caching is disabled or the file is not cached
+        self._cache_key = None
+        if self._cache_dir is None:
+            return False
+        self._cache_key = self._get_cache_key(file_path)
+        arrays = load_arrays(self._get_cache_paths())
+        if arrays is None:
+            return False
+        self.datetimes, self.values = arrays
+        return True
+
+    def _save_cached(self):
+        if self._cache_key is None:
+            return
+        for path, array in zip(self._get_cache_paths(), (self.datetimes, self.values)):
+            save_array(path, array)
+
+    def _read_table(self, file_path):
+        self._csv_table = _read_csv(file_path)
 
     def _format_table(self):
-        for row in self.table:
-            # replace date-time string with DateTime object and change year to DateTime.ANY_YEAR
-            row[0] = DateTime.from_datetime_str(row[0], self.datetime_fmt)
-            row[0].year = ANY_YEAR
-            # convert to local time if needed
-            if self.tz_str != 'UTC':
-                row[0] = row[0].convert_to_lt(self.tz_str)
-            # convert the values in the next cells to float
-            for col_index in range(1, len(row)):
-                try:
-                    row[col_index] = float(row[col_index])
-                except ValueError:
-                    row[col_index] = math.nan
+        self.datetimes, self.values = _format_columns(self._csv_table, self.datetime_fmt, self.tz_str)
+        del self._csv_table
+
+    @property
+    def table(self) -> List[list]:
+        """
+        Get the rows of the file (without header) as lists of a DateTime object (local time, with year ANY_YEAR)
+        followed by the float values (NaN if a value is not a number), like the table of the former row-by-row
+        parser. The table is built from the columns each time it is asked for, so changes to it are not kept.
+        """
+        seconds = self.datetimes.astype('datetime64[s]').astype(np.int64).tolist()
+        return [[DateTime.from_epoch_seconds(s), *values] for s, values in zip(seconds, self.values.tolist())]
 
     def _split_table(self):
-        # rows with the same date are put into separate datasets; so each dataset covers one day
-        self.daily_dataset_list = []
-        search_date = self.table[0][0].date
-        dataset = []
-        for row in self.table:
-            if row[0].date == search_date:
-                dataset.append(row)
-            else:
-                self.daily_dataset_list.append(dataset)
-                dataset = []
-                search_date = row[0].date
-                dataset.append(row)
-        self.daily_dataset_list.append(dataset)
+        # rows with the same date are put into separate datasets; so each dataset covers one day: the datasets are
+        # given by the indexes in the columns where a new day starts
+        self.day_bounds = _get_day_bounds(self.datetimes)
 
     @staticmethod
-    def _transform_dataset(data_set):
+    def _transform_dataset(datetimes, values):
         pass
 
     def _transform_datasets(self):
-        self.daily_dataset_list = [self._transform_dataset(data_set) for data_set in self.daily_dataset_list]
+        self.daily_dataset_list = [
+            self._transform_dataset(self.datetimes[start:end], self.values[start:end])
+            for start, end in zip(self.day_bounds[:-1], self.day_bounds[1:])
+        ]
 
     def get_daily_datasets(self):
         return self.daily_dataset_list
 
+    @classmethod
+    def iter_daily_datasets(cls, file_path, datetime_fmt='%d/%m/%Y %H:%M:%S', tz_str='UTC', chunk_size=100_000):
+        """
+        Generator that reads the file in chunks of 'chunk_size' rows and yields the same daily datasets as
+        get_daily_datasets(), but one day at a time. Only one chunk of the file is held in memory at once, whatever
+        the size of the file.
+        """
+        datetimes, values = None, None
+        for table in _read_csv(file_path, chunk_size):
+            chunk_datetimes, chunk_values = _format_columns(table, datetime_fmt, tz_str)
+            if datetimes is None:
+                datetimes, values = chunk_datetimes, chunk_values
+            else:
+                datetimes = np.concatenate((datetimes, chunk_datetimes))
+                values = np.concatenate((values, chunk_values))
+            day_bounds = _get_day_bounds(datetimes)
+            # the last day of the chunk can continue in the next chunk
+            for start, end in zip(day_bounds[:-2], day_bounds[1:-1]):
+                yield cls._transform_dataset(datetimes[start:end], values[start:end])
+            datetimes, values = datetimes[day_bounds[-2]:], values[day_bounds[-2]:]
+        if datetimes is not None and len(datetimes) > 0:
+            yield cls._transform_dataset(datetimes, values)
+
+
+def _read_csv(file_path, chunk_size=None):
+    # the first row of the file (= table header) is skipped; all cells are read as strings; with 'chunk_size' an
+    # iterator over tables of 'chunk_size' rows is returned
+    return pd.read_csv(file_path, quotechar='"', dtype=str, keep_default_na=False, chunksize=chunk_size)
+
+
+def _format_columns(table: pd.DataFrame, datetime_fmt: str, tz_str: str):
+    # parse date-time strings and change year to ANY_YEAR
+    datetimes = pd.to_datetime(table.iloc[:, 0].to_numpy(), format=datetime_fmt).to_numpy().astype('datetime64[s]')
+    datetimes = _replace_year(datetimes, ANY_YEAR)
+    # convert to local time if needed
+    if tz_str != 'UTC':
+        datetimes = convert_to_lt_array(datetimes, tz_str)
+    # convert the values in the next columns to float (NaN if the value is not a number)
+    values = table.iloc[:, 1:].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=np.float64)
+    return datetimes, values
+
+
+def _get_day_bounds(datetimes: np.ndarray) -> np.ndarray:
+    # indexes where a new day starts, preceded by 0 and followed by the number of date-times
+    dates = datetimes.astype('datetime64[D]')
+    new_day = np.flatnonzero(dates[1:] != dates[:-1]) + 1
+    return np.concatenate(([0], new_day, [len(dates)]))
+
+
+def _replace_year(datetimes: np.ndarray, year: int) -> np.ndarray:
+    # change the year of NumPy datetime64 date-times, keeping month, day and time of the day
+    months = datetimes.astype('datetime64[M]')
+    month_numbers = months - datetimes.astype('datetime64[Y]')
+    new_months = np.datetime64(f'{year:04d}', 'Y').astype('datetime64[M]') + month_numbers
+    new_datetimes = new_months + (datetimes - months)
+    if np.any(new_datetimes.astype('datetime64[M]') != new_months):
+        raise ValueError('day is out of range for month')
+    return new_datetimes
+
+
+def _split_datetimes(datetimes: np.ndarray):
+    # Date of the first date-time and list of Time objects of a day
+    seconds = datetimes.astype('datetime64[s]').astype(np.int64).tolist()
+    return Date.from_epoch_seconds(seconds[0]), [Time.from_epoch_seconds(s) for s in seconds]
+
 
 class TMYDataFetcher(_CSVDataFetcher):
     """Class for reading and preparing the meteo data."""
     @staticmethod
-    def _transform_dataset(dataset):
-        row = dataset[0]
-        time_list = []
-        temperature_list = []
-        irradiance_list = []
-        for row in dataset:
-            time_list.append(row[0].time)
-            temperature_list.append(row[1])
-            irradiance_list.append(row[2])
+    def _transform_dataset(datetimes, values):
+        date, time_list = _split_datetimes(datetimes)
         return {
-            'date': row[0].date,
+            'date': date,
             'time': time_list,
-            'temperature': temperature_list,
-            'irradiance': irradiance_list
+            'temperature': values[:, 0].tolist(),
+            'irradiance': values[:, 1].tolist()
         }
 
 
 class CLPDataFetcher(_CSVDataFetcher):
     """Class for reading and preparing the consumer load profile data."""
     @staticmethod
-    def _transform_dataset(dataset):
-        row = dataset[0]
-        time_list = []
-        CLP_list = []
-        for row in dataset:
-            time_list.append(row[0].time)
-            CLP_list.append(row[1])
+    def _transform_dataset(datetimes, values):
+        date, time_list = _split_datetimes(datetimes)
         return {
-            'date': row[0].date,
+            'date': date,
             'time': time_list,
-            'CLP': CLP_list,
+            'CLP': values[:, 0].tolist(),
         }
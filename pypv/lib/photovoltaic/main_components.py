@@ -1,4 +1,4 @@
-from typing import List, Optional, Tuple, Dict
+from typing import List, Optional, Tuple, Dict, Iterable
 import collections
 import math
 
@@ -8,7 +8,7 @@ from nummath import roots, graphing, interpolation
 from sun.energy import Surface, SunEnergyCalculator
 from sun.geometry import SunPositionCalculator, Location
 from sun.horizon import HorizonProfile
-from quantities.date_time import Date, Time
+from quantities.date_time import Date, Time, DateTime
 import photovoltaic.auxiliary_components as pv_aux
 import photovoltaic.exceptions as pv_err
 
@@ -38,8 +38,20 @@ class TemperatureCoefficients:
         self.Pmpp = cPmpp / 100.0 if cPmpp else 0.0
 
 
+# immutable snapshot of the working conditions of a solar panel
+OperatingPoint = collections.namedtuple('OperatingPoint', ['G', 'Tc', 'Isc', 'Voc', 'Impp', 'Vmpp', 'Pmpp'])
+
+
 class PhotoVoltaicCharacteristics:
-    def __init__(self, stc: STC, tco: TemperatureCoefficients, noct: float, Irev_max=None):
+    SOLVERS = ('newton', 'reference')
+
+    def __init__(self, stc: STC, tco: TemperatureCoefficients, noct: float, Irev_max=None, solver: str = 'newton'):
+        # solver used to calculate the V,I-characteristic:
+        # - 'newton': batched Newton-Raphson on the whole voltage axis at once (default)
+        # - 'reference': root finding with incremental search and bisection, one voltage at a time
+        if solver not in self.SOLVERS:
+            raise ValueError(f'{solver} is not recognized')
+        self.solver = solver
         self.stc = stc
         self.tco = tco
 
@@ -63,8 +75,17 @@ class PhotoVoltaicCharacteristics:
         self._axV = None    # voltage axis of V,I- or V,P-characteristic
         self._axP = None    # power axis of V,P-characteristic
 
-        # default characteristics are under stc
-        self._calculate_characteristics()
+        # default characteristics are under stc; they are only calculated when they are asked for
+        self._characteristics_outdated = True
+
+        # optional LRU cache of working conditions and characteristics (see enable_cache(...))
+        self._cache: Optional[collections.OrderedDict] = None
+        self._cache_key = None
+        self._cache_maxsize = 0
+        self._cache_G_step = 1.0
+        self._cache_Tc_step = 0.1
+        self._cache_hits = 0
+        self._cache_misses = 0
 
     def set_irradiance(self, val):
         self.awc.G = val
@@ -78,35 +99,179 @@ class PhotoVoltaicCharacteristics:
 
     def set_ambient_temperature(self, val):
         self.Tamb = val
-        self.awc.Tc = self.Tamb + (self.noct - 20.0) / 800.0 * self.awc.G
+        self.awc.Tc = self.cell_temperature(self.Tamb, self.awc.G)
         # self._calculate_awc()
         # self._calculate_characteristics()
 
     def calculate_characteristics(self):
-        self._calculate_awc()
-        self._calculate_characteristics()
+        # only the actual working conditions (MPP, open circuit, short circuit) are updated immediately; the
+        # V,I- and V,P-characteristic are recalculated the next time they are asked for
+        if self._cache is not None and math.isfinite(self.awc.G) and math.isfinite(self.awc.Tc):
+            self._calculate_awc_cached()
+        else:
+            self._cache_key = None
+            self._calculate_awc()
+        self._characteristics_outdated = True
+
+    def _update_characteristics(self):
+        if self._characteristics_outdated:
+            entry = self._cache.get(self._cache_key) if self._cache is not None else None
+            if entry is not None and entry['characteristics'] is not None:
+                self._Rpv, self._Vt, self._I0, self._axV, self._axI, self._axP = entry['characteristics']
+            else:
+                self._calculate_characteristics()
+                if entry is not None:
+                    entry['characteristics'] = (self._Rpv, self._Vt, self._I0, self._axV, self._axI, self._axP)
+            self._characteristics_outdated = False
+
+    def enable_cache(self, maxsize: int = 256, G_step: float = 1.0, Tc_step: float = 0.1):
+        """
+        Enable a least-recently-used cache of working conditions and characteristics, keyed on irradiance and cell
+        temperature quantized with steps 'G_step' [W/m²] and 'Tc_step' [°C]. When the cache is full, the least
+        recently used entry is removed.
+        The cache is used by calculate_characteristics() and by evaluate(...), and so by the operating point
+        evaluations of solar panels, PV matrices and the inverter checks. Array evaluations (calculate_awc_array(...))
+        are not cached.
+        Note: with the cache enabled, working conditions are calculated at the irradiance and cell temperature
+        rounded to the nearest multiple of their quantization step.
+        """
+        self._cache = collections.OrderedDict()
+        self._cache_key = None
+        self._cache_maxsize = maxsize
+        self._cache_G_step = G_step
+        self._cache_Tc_step = Tc_step
+        self._cache_hits = 0
+        self._cache_misses = 0
+
+    def disable_cache(self):
+        self._cache = None
+        self._cache_key = None
+
+    def cache_info(self) -> Dict[str, int]:
+        """Get number of cache hits and misses, the actual size and the maximum size of the cache."""
+        return {
+            'hits': self._cache_hits,
+            'misses': self._cache_misses,
+            'size': len(self._cache) if self._cache is not None else 0,
+            'maxsize': self._cache_maxsize
+        }
+
+    def _lookup_cache(self, G, Tc):
+        # get the cache key of the quantized irradiance and cell temperature and the cache entry with the working
+        # conditions at that key, which is calculated if it is not in the cache yet; evaluate(...) can call this from
+        # several threads at once, so an entry may already have been removed by another thread
+        key = (round(G / self._cache_G_step), round(Tc / self._cache_Tc_step))
+        entry = self._cache.get(key)
+        if entry is not None:
+            self._cache_hits += 1
+            try:
+                self._cache.move_to_end(key)
+            except KeyError:
+                pass
+        else:
+            self._cache_misses += 1
+            Isc, Voc, Impp, Vmpp = self._working_conditions(key[0] * self._cache_G_step, key[1] * self._cache_Tc_step)
+            entry = {'awc': (Isc, Voc, Impp, Vmpp, Impp * Vmpp), 'characteristics': None}
+            self._cache[key] = entry
+            while len(self._cache) > self._cache_maxsize:
+                try:
+                    self._cache.popitem(last=False)
+                except KeyError:
+                    break
+        return key, entry
+
+    def _calculate_awc_cached(self):
+        self._cache_key, entry = self._lookup_cache(self.awc.G, self.awc.Tc)
+        self.awc.Isc, self.awc.Voc, self.awc.Impp, self.awc.Vmpp, self.awc.Pmpp = entry['awc']
 
     def _calculate_awc(self):
-        d_Tc = self.stc.Tc - self.awc.Tc
-        self.awc.Isc = self.stc.Isc * (self.awc.G / self.stc.G) * (1.0 - self.tco.Isc * d_Tc)
-        self.awc.Voc = self.stc.Voc * (1.0 - self.tco.Voc * d_Tc)
-        self.awc.Impp = self.stc.Impp * (self.awc.G / self.stc.G) * (1.0 - self.tco.Impp * d_Tc)
-        self.awc.Vmpp = self.stc.Vmpp * (1.0 - self.tco.Vmpp * d_Tc)
+        self.awc.Isc, self.awc.Voc, self.awc.Impp, self.awc.Vmpp = self._working_conditions(self.awc.G, self.awc.Tc)
         self.awc.Pmpp = self.awc.Impp * self.awc.Vmpp
 
+    def _working_conditions(self, G, Tc):
+        # G and Tc can be floats or NumPy arrays
+        d_Tc = self.stc.Tc - Tc
+        Isc = self.stc.Isc * (G / self.stc.G) * (1.0 - self.tco.Isc * d_Tc)
+        Voc = self.stc.Voc * (1.0 - self.tco.Voc * d_Tc)
+        Impp = self.stc.Impp * (G / self.stc.G) * (1.0 - self.tco.Impp * d_Tc)
+        Vmpp = self.stc.Vmpp * (1.0 - self.tco.Vmpp * d_Tc)
+        return Isc, Voc, Impp, Vmpp
+
+    def evaluate(self, G: float, Tc: float) -> OperatingPoint:
+        """
+        Get the working conditions at irradiance 'G' [W/m²] and cell temperature 'Tc' [°C] as an immutable
+        OperatingPoint. Unlike calculate_characteristics() the state of the object is not changed, so the same
+        PhotoVoltaicCharacteristics object can be evaluated from several threads at once.
+        With the cache enabled (see enable_cache(...)), the working conditions are taken from the cache.
+        """
+        if self._cache is not None and np.ndim(G) == 0 and np.ndim(Tc) == 0 and math.isfinite(G) and math.isfinite(Tc):
+            _, entry = self._lookup_cache(G, Tc)
+            Isc, Voc, Impp, Vmpp, Pmpp = entry['awc']
+            return OperatingPoint(G=G, Tc=Tc, Isc=Isc, Voc=Voc, Impp=Impp, Vmpp=Vmpp, Pmpp=Pmpp)
+        Isc, Voc, Impp, Vmpp = self._working_conditions(G, Tc)
+        return OperatingPoint(G=G, Tc=Tc, Isc=Isc, Voc=Voc, Impp=Impp, Vmpp=Vmpp, Pmpp=Impp * Vmpp)
+
+    def cell_temperature(self, Tamb, G):
+        """Get cell temperature [°C] from ambient temperature [°C] and irradiance [W/m²] (floats or NumPy arrays)."""
+        return Tamb + (self.noct - 20.0) / 800.0 * G
+
+    def calculate_awc_array(self, G: np.ndarray, Tc: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Get the actual working conditions for arrays of irradiance 'G' [W/m²] and cell temperature 'Tc' [°C] at once.
+        The state of the object (self.awc) is not changed.
+        """
+        G = np.asarray(G, dtype=np.float64)
+        Tc = np.asarray(Tc, dtype=np.float64)
+        Isc, Voc, Impp, Vmpp = self._working_conditions(G, Tc)
+        # like in the scalar case, the open circuit and MPP voltage do not depend on irradiance
+        Voc = np.broadcast_to(Voc, G.shape).copy()
+        Vmpp = np.broadcast_to(Vmpp, G.shape).copy()
+        return {'Isc': Isc, 'Voc': Voc, 'Impp': Impp, 'Vmpp': Vmpp, 'Pmpp': Impp * Vmpp}
+
+    @staticmethod
+    def model_parameters(Isc, Voc, Impp, Vmpp):
+        """
+        Get the photovoltaic resistor Rpv [ohm] and the temperature voltage Vt [V] of the one-diode model that fits the
+        working conditions (floats or NumPy arrays, with Impp and Vmpp not zero).
+        """
+        k = [-5.411, 6.450, 3.417, -4.422]
+        k[0] = k[0] * (Impp * Vmpp) / (Isc * Voc)
+        k[1] = k[1] * Vmpp / Voc
+        k[2] = k[2] * Impp / Isc
+        grad = (Voc / Isc) * sum(k)
+        ir = Isc / Impp
+        Rpv = -grad * ir + (Vmpp / Impp) * (1.0 - ir)
+        Vt = -(grad + Rpv) * Isc
+        return Rpv, Vt
+
+    @classmethod
+    def calculate_voltages(cls, I, Isc, Voc, Impp, Vmpp) -> np.ndarray:
+        """
+        Get the voltages at currents 'I' from the closed-form inverse V = Vt * ln((Isc - I) / I0 + 1) - I * Rpv of the
+        one-diode model. Currents and working conditions are broadcast against each other, so the V,I-curves of
+        several panel types can be calculated at once (e.g. working conditions of shape (n, 1) and currents of shape
+        (m,) give voltages of shape (n, m)). At currents above the short circuit current, or if the solar panel does
+        not produce power, the bypass diode of the solar panel conducts and the voltage is zero.
+        """
+        I, Isc, Voc, Impp, Vmpp = (np.asarray(a, dtype=np.float64) for a in (I, Isc, Voc, Impp, Vmpp))
+        # invalid results (e.g. at I >= Isc or if Isc = 0) are masked afterwards
+        with np.errstate(all='ignore'):
+            Rpv, Vt = cls.model_parameters(Isc, Voc, Impp, Vmpp)
+            # with I0 = Isc / exp(Voc / Vt): ln((Isc - I) / I0 + 1) = ln(exp(ln(1 - I / Isc) + Voc / Vt) + 1)
+            V = Vt * np.logaddexp(np.log1p(-I / Isc) + Voc / Vt, 0.0) - I * Rpv
+        V = np.where((I < Isc) & (Impp * Vmpp > 0.0), V, 0.0)
+        return np.maximum(V, 0.0)
+
     def _calculate_characteristics(self):
         if self.awc.Pmpp != 0.0:
-            k = [-5.411, 6.450, 3.417, -4.422]
-            k[0] = k[0] * (self.awc.Impp * self.awc.Vmpp) / (self.awc.Isc * self.awc.Voc)
-            k[1] = k[1] * self.awc.Vmpp / self.awc.Voc
-            k[2] = k[2] * self.awc.Impp / self.awc.Isc
-            grad = (self.awc.Voc / self.awc.Isc) * sum(k)
-            ir = self.awc.Isc / self.awc.Impp
-            self._Rpv = -grad * ir + (self.awc.Vmpp / self.awc.Impp) * (1.0 - ir)
-            self._Vt = -(grad + self._Rpv) * self.awc.Isc
+            self._Rpv, self._Vt = self.model_parameters(self.awc.Isc, self.awc.Voc, self.awc.Impp, self.awc.Vmpp)
             self._I0 = self.awc.Isc / np.exp(self.awc.Voc / self._Vt)
             self._axV = np.linspace(0.0, self.awc.Voc, endpoint=True)
-            self._axI = np.array([self._calculate_current(V) for V in self._axV])
+            # Newton-Raphson only converges monotonically if the photovoltaic resistor is positive
+            if self.solver == 'newton' and self._Rpv > 0.0:
+                self._axI = self._calculate_currents(self._axV)
+            else:
+                self._axI = np.array([self._calculate_current(V) for V in self._axV])
             self._axP = self._axI * self._axV
         else:
             self._axV = np.linspace(0.0, self.awc.Voc, endpoint=True)
@@ -124,8 +289,27 @@ class PhotoVoltaicCharacteristics:
         except IndexError:
             return 0.0
 
+    def _calculate_currents(self, V: np.ndarray, tol: float = 1.0e-9, max_iter: int = 50) -> np.ndarray:
+        """
+        Calculate the currents at all voltages in array 'V' in one pass using batched Newton-Raphson.
+        The function f(I) = I - Isc + I0 * (exp((V + I * Rpv) / Vt) - 1) is increasing and convex in I, so starting
+        from I = Isc the iterations approach the root from above without overshooting it.
+        """
+        Isc, Voc = self.awc.Isc, self.awc.Voc
+        I = np.full_like(V, Isc)
+        for _ in range(max_iter):
+            # I0 * exp((V + I * Rpv) / Vt) written relative to Voc, so that exp() cannot overflow
+            e = Isc * np.exp((V + I * self._Rpv - Voc) / self._Vt)
+            dI = (I - Isc + e - self._I0) / (1.0 + e * self._Rpv / self._Vt)
+            I = I - dI
+            if np.max(np.abs(dI)) < tol:
+                break
+        # like the reference solver: if the root lies outside the search area [0, Isc] the current is zero
+        return np.where((I >= 0.0) & (I <= Isc), I, 0.0)
+
     def plot_characteristic(self, which, size=None, dpi=None, title=None):
         if which in ['current', 'power']:
+            self._update_characteristics()
             if which == 'current':
                 name, y_title, y_axis = 'V,I', 'I[A]', self._axI
             else:
@@ -141,12 +325,16 @@ class PhotoVoltaicCharacteristics:
         return None
 
     def get_characteristics(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        self._update_characteristics()
         return self._axV, self._axI, self._axP
 
 
 Orientation = collections.namedtuple('Orientation', ['azimuth', 'tilt'])
 Dimensions = collections.namedtuple('Dimensions', ['width', 'height'])
 
+# immutable snapshot of the working conditions of a PV matrix
+MatrixOperatingPoint = collections.namedtuple('MatrixOperatingPoint', ['Prd', 'Pmpp', 'Vmpp', 'Impp', 'Voc', 'Isc'])
+
 
 class SolarPanel(Surface):
     def __init__(
@@ -160,7 +348,7 @@ class SolarPanel(Surface):
         self.pv_char = pv_char
         self.loc = loc
         self.hz_profile = None
-        self.group = None  # used in SolarPanelMatrix where solar panels are grouped according to their horizon profile
+        self.group = None  # id of the horizon profile of the solar panel, set when registered as panel type
         self.orient = orient
         self.dim = dim
         super().__init__(orient.azimuth, orient.tilt, dim.width, dim.height, hz_profile)
@@ -175,12 +363,7 @@ class SolarPanel(Surface):
             Tambient: float = None
     ):
         if None not in (date, time, Gglh, Tambient):
-            if Gglh > 0.0:
-                sp = SunPositionCalculator.calculate_position(self.loc, date, time)
-                G = SunEnergyCalculator(sp, self, date.day_number).calculate_irradiance(Gglh)
-                self.pv_char.set_irradiance(G)
-            else:
-                self.pv_char.set_irradiance(0.0)
+            self.pv_char.set_irradiance(self._irradiance(date, time, Gglh))
             self.pv_char.set_ambient_temperature(Tambient)
         if None not in (Gsurf, Tambient):
             self.pv_char.set_irradiance(Gsurf)
@@ -190,6 +373,58 @@ class SolarPanel(Surface):
             self.pv_char.set_cell_temperature(Tcell)
         self.pv_char.calculate_characteristics()
 
+    def evaluate_operating_point(
+            self,
+            date: Date = None,
+            time: Time = None,
+            Gsurf: float = None,
+            Gglh: float = None,
+            Tcell: float = None,
+            Tambient: float = None
+    ) -> OperatingPoint:
+        """
+        Same as set_operating_conditions(...), but the working conditions are returned as an immutable OperatingPoint
+        and the (shared) photovoltaic characteristics of the solar panel are left untouched.
+        """
+        G = Tc = None
+        if None not in (date, time, Gglh, Tambient):
+            G = self._irradiance(date, time, Gglh)
+            Tc = self.pv_char.cell_temperature(Tambient, G)
+        if None not in (Gsurf, Tambient):
+            G = Gsurf
+            Tc = self.pv_char.cell_temperature(Tambient, G)
+        if None not in (Gsurf, Tcell):
+            G = Gsurf
+            Tc = Tcell
+        if G is None:
+            raise ValueError('operating conditions are incomplete')
+        return self.pv_char.evaluate(G, Tc)
+
+    def _irradiance(self, date: Date, time: Time, Gglh: float) -> float:
+        # irradiance on the solar panel from global irradiance on the horizontal plane
+        if Gglh > 0.0:
+            sp = SunPositionCalculator.calculate_position(self.loc, date, time)
+            py_datetime = DateTime(date=date, time=time).py_datetime
+            return SunEnergyCalculator(sp, self, date.day_number, self.loc, py_datetime).calculate_irradiance(Gglh)
+        return 0.0
+
+    def evaluate_series(self, datetimes: np.ndarray, Gglh: np.ndarray, Tamb: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Calculate the operating conditions of the solar panel for a whole time series at once.
+        Params:
+            - datetimes     array of local date-times (NumPy datetime64)
+            - Gglh          array of global irradiance on the horizontal plane [W/m²]
+            - Tamb          array of ambient temperatures [°C]
+        Returns a dict with arrays of plane-of-array irradiance 'G' [W/m²], cell temperature 'Tc' [°C] and the actual
+        working conditions 'Isc', 'Voc', 'Impp', 'Vmpp' and 'Pmpp'. The state of the solar panel is not changed.
+        """
+        datetimes = np.asarray(datetimes, dtype='datetime64[s]')
+        Gglh = np.asarray(Gglh, dtype=np.float64)
+        Tamb = np.asarray(Tamb, dtype=np.float64)
+        G = calculate_irradiances([self], datetimes, Gglh)[0]
+        Tc = self.pv_char.cell_temperature(Tamb, G)
+        return {'G': G, 'Tc': Tc, **self.pv_char.calculate_awc_array(G, Tc)}
+
     def get_solar_power(self) -> float:
         return self.pv_char.awc.G * self.area
 
@@ -218,14 +453,219 @@ class SolarPanel(Surface):
         )
 
 
+def calculate_irradiances(solar_panels: List[SolarPanel], datetimes: np.ndarray, Gglh: np.ndarray) -> np.ndarray:
+    """
+    Calculate the irradiance on each of the solar panels for a whole time series at once.
+    Params:
+        - datetimes     array of local date-times (NumPy datetime64)
+        - Gglh          array of global irradiance on the horizontal plane [W/m²]
+    Returns an array (number of solar panels x number of date-times) of irradiance on the solar panels [W/m²].
+    """
+    datetimes = np.asarray(datetimes, dtype='datetime64[s]')
+    Gglh = np.asarray(Gglh, dtype=np.float64)
+    G = np.zeros((len(solar_panels), Gglh.size))
+    # like in SolarPanel.set_operating_conditions, irradiance is only calculated if there is global irradiance
+    day = Gglh > 0.0
+    if not np.any(day):
+        return G
+    days = datetimes[day].astype('datetime64[D]')
+    day_numbers = (days - days.astype('datetime64[Y]')).astype(np.int64) + 1
+    # sun positions are calculated once for all the solar panels at the same location
+    locations = {}
+    for i, solar_panel in enumerate(solar_panels):
+        locations.setdefault(id(solar_panel.loc), (solar_panel.loc, []))[1].append(i)
+    for loc, indices in locations.values():
+        sun_positions = SunPositionCalculator.calculate_positions(loc, datetimes[day])
+        G[np.ix_(indices, np.flatnonzero(day))] = SunEnergyCalculator.calculate_irradiances(
+            sun_positions, [solar_panels[i] for i in indices], day_numbers, Gglh[day],
+            location=loc, timestamps=datetimes[day]
+        )
+    return G
+
+
+def evaluate_orientation_grid(
+        loc: Location,
+        pv_char: PhotoVoltaicCharacteristics,
+        azimuths: np.ndarray,
+        tilts: np.ndarray,
+        datetimes: np.ndarray,
+        Gglh: np.ndarray,
+        Tamb: np.ndarray,
+        hz_profile: HorizonProfile = None,
+        time_step: float = None,
+        chunk_size: int = 64
+) -> Dict[str, np.ndarray]:
+    """
+    Calculate the irradiation and MPP energy of a solar panel for every combination of azimuth and tilt angle in
+    'azimuths' and 'tilts' [°] over a weather time series. The sun positions and the diffuse irradiance are calculated
+    only once for the whole grid of orientations.
+    Params:
+        - datetimes     array of local date-times (NumPy datetime64)
+        - Gglh          array of global irradiance on the horizontal plane [W/m²]
+        - Tamb          array of ambient temperatures [°C]
+        - time_step     duration of one time step of the series [h]; if None, the median interval between the
+                        date-times is used
+        - chunk_size    maximum number of orientations that are calculated at once (limits memory usage)
+    Returns a dict with the 'azimuth' and 'tilt' grids and the plane-of-array irradiation 'Hpoa' [kWh/m²] and the MPP
+    energy 'Empp' [kWh] per solar panel, all 2D-arrays (number of azimuths x number of tilts).
+    """
+    datetimes = np.asarray(datetimes, dtype='datetime64[s]')
+    Gglh = np.asarray(Gglh, dtype=np.float64)
+    Tamb = np.asarray(Tamb, dtype=np.float64)
+    if time_step is None:
+        time_step = float(np.median(np.diff(datetimes).astype(np.float64))) / 3600.0 if len(datetimes) > 1 else 1.0
+    azimuth_grid, tilt_grid = np.meshgrid(np.asarray(azimuths, dtype=np.float64), np.asarray(tilts, dtype=np.float64),
+                                          indexing='ij')
+    Hpoa = np.zeros(azimuth_grid.size)
+    Empp = np.zeros(azimuth_grid.size)
+
+    # like in SolarPanel.set_operating_conditions, irradiance is only calculated if there is global irradiance
+    day = Gglh > 0.0
+    if np.any(day):
+        sun_positions = SunPositionCalculator.calculate_positions(loc, datetimes[day])
+        days = datetimes[day].astype('datetime64[D]')
+        day_numbers = (days - days.astype('datetime64[Y]')).astype(np.int64) + 1
+        surfaces = [
+            Surface(azimuth, tilt, 1.0, 1.0, hz_profile)
+            for azimuth, tilt in zip(azimuth_grid.ravel(), tilt_grid.ravel())
+        ]
+        for start in range(0, len(surfaces), chunk_size):
+            G = SunEnergyCalculator.calculate_irradiances(
+                sun_positions, surfaces[start:start + chunk_size], day_numbers, Gglh[day],
+                location=loc, timestamps=datetimes[day]
+            )
+            awc = pv_char.calculate_awc_array(G, pv_char.cell_temperature(Tamb[day], G))
+            Hpoa[start:start + chunk_size] = G.sum(axis=1) * time_step / 1000.0
+            Empp[start:start + chunk_size] = awc['Pmpp'].sum(axis=1) * time_step / 1000.0
+    return {
+        'azimuth': azimuth_grid,
+        'tilt': tilt_grid,
+        'Hpoa': Hpoa.reshape(azimuth_grid.shape),
+        'Empp': Empp.reshape(azimuth_grid.shape)
+    }
+
+
+class PanelTypeRegistry:
+    """
+    Registry of unique solar panel types. Solar panels of the same class with the same location, orientation,
+    dimensions, photovoltaic characteristics and horizon profile points are physically identical: they are represented
+    by one panel type, which needs to be evaluated only once per set of operating conditions, whatever the number of
+    PV matrices or inverters it is used in.
+    Each PV matrix has a registry of its own, unless a registry is passed to it; panel types that are shared by the
+    PV matrices of a whole PV system are found with evaluate_panel_types(...) or get_unique_panel_types(...).
+    """
+    def __init__(self):
+        self.panel_types: List[SolarPanel] = []
+        self._panel_type_indices: Dict[tuple, int] = {}
+
+    @staticmethod
+    def get_key(solar_panel: SolarPanel) -> tuple:
+        """
+        Get the inputs that determine the working conditions of a solar panel: the class of the solar panel, the
+        coordinates and time zone of its location, its orientation and dimensions, the parameters of its photovoltaic
+        characteristics and the azimuth and elevation of the points of its horizon profile.
+        """
+        loc, pv_char, hz_profile = solar_panel.loc, solar_panel.pv_char, solar_panel.hz_profile
+        return (
+            type(solar_panel),
+            (loc.latitude, loc.longitude, loc.altitude, loc.timezone),
+            tuple(solar_panel.orient),
+            tuple(solar_panel.dim),
+            (pv_char.stc.Isc, pv_char.stc.Voc, pv_char.stc.Impp, pv_char.stc.Vmpp, pv_char.stc.G, pv_char.stc.Tc),
+            (pv_char.tco.Isc, pv_char.tco.Voc, pv_char.tco.Impp, pv_char.tco.Vmpp, pv_char.tco.Pmpp),
+            pv_char.noct,
+            pv_char.Irev_max,
+            pv_char.solver,
+            (tuple(hz_profile.azimuth_ax), tuple(hz_profile.elevation_ax)) if hz_profile else None
+        )
+
+    def register(self, solar_panel: SolarPanel) -> SolarPanel:
+        """Get the panel type of the given solar panel. A new panel type is created if it does not exist yet."""
+        key = self.get_key(solar_panel)
+        i = self._panel_type_indices.get(key)
+        if i is None:
+            panel_type = solar_panel.duplicate()
+            panel_type.group = panel_type.hz_profile.id if panel_type.hz_profile else 'default'
+            i = len(self.panel_types)
+            self.panel_types.append(panel_type)
+            self._panel_type_indices[key] = i
+        # like the panel type, the solar panel knows the horizon profile group it belongs to
+        solar_panel.group = solar_panel.hz_profile.id if solar_panel.hz_profile else 'default'
+        return self.panel_types[i]
+
+    def clear(self):
+        self.panel_types = []
+        self._panel_type_indices = {}
+
+
+def get_unique_panel_types(panel_types: Iterable[SolarPanel]) -> Dict[SolarPanel, SolarPanel]:
+    """
+    Map each of the given panel types (e.g. of all the PV matrices of a PV system) to the first of them that is
+    physically identical to it (see PanelTypeRegistry.get_key(...)).
+    """
+    unique_types = {}
+    mapping = {}
+    for panel_type in panel_types:
+        if panel_type not in mapping:
+            mapping[panel_type] = unique_types.setdefault(PanelTypeRegistry.get_key(panel_type), panel_type)
+    return mapping
+
+
+def evaluate_panel_types(
+        panel_types: Iterable[SolarPanel],
+        date: Date = None,
+        time: Time = None,
+        Gsurf: float = None,
+        Gglh: float = None,
+        Tcell: float = None,
+        Tambient: float = None
+) -> Dict[SolarPanel, OperatingPoint]:
+    """
+    Evaluate the given panel types; physically identical panel types (see get_unique_panel_types(...)) are evaluated
+    only once. The returned operating points can be passed to SolarPanelMatrix.evaluate_operating_point(...) of all
+    the PV matrices that use these panel types.
+    """
+    mapping = get_unique_panel_types(panel_types)
+    ops = {
+        panel_type: panel_type.evaluate_operating_point(date, time, Gsurf, Gglh, Tcell, Tambient)
+        for panel_type in dict.fromkeys(mapping.values())
+    }
+    return {panel_type: ops[unique_type] for panel_type, unique_type in mapping.items()}
+
+
 class SolarPanelMatrix:
-    def __init__(self, id_: str, row_num: int, col_num: int):
+    MPP_METHODS = ('panel', 'curve')
+
+    def __init__(
+            self,
+            id_: str,
+            row_num: int,
+            col_num: int,
+            registry: PanelTypeRegistry = None,
+            mpp_method: str = 'panel',
+            n_points: int = 200
+    ):
+        # method used to determine the MPP of the matrix in evaluate_operating_point(...):
+        # - 'panel': sum of the MPP voltages of the solar panels in the first string and of the MPP currents of the
+        #   solar panels in the first row (default)
+        # - 'curve': maximum of the combined V,I-characteristic of all the strings in the matrix (see
+        #   evaluate_characteristics(...)), which takes mismatch between the solar panels into account
+        if mpp_method not in self.MPP_METHODS:
+            raise ValueError(f'{mpp_method} is not recognized')
         self.id = id_
         self.row_num = row_num  # number of solar panels in one string
         self.col_num = col_num  # number of strings
-        self.matrix: List[List[Optional[SolarPanel]]] = [[None for _ in range(col_num)] for _ in range(row_num)]
-        # put panels with the same horizon profile in a separate group (see group_panel(...))
-        self._panel_groups = {'default': []}
+        self.registry = registry if registry is not None else PanelTypeRegistry()
+        self.mpp_method = mpp_method
+        self.n_points = n_points  # number of points on the current and voltage axis of the combined characteristic
+        # each cell of the matrix holds an index into the table of panel types used in the matrix (-1 = empty)
+        self._cells = np.full((row_num, col_num), -1, dtype=np.int16)
+        self._panel_types: List[SolarPanel] = []
+        self._matrix = None  # object array view on the matrix, created on demand (see property 'matrix')
+        self._strings = None  # composition of the different strings in the matrix, created on demand
+        # operating points of the panel types and of the matrix last set with set_operating_conditions(...)
+        self._operating_points: Optional[Dict[SolarPanel, OperatingPoint]] = None
+        self._operating_point: Optional[MatrixOperatingPoint] = None
 
         self.string_protection = pv_aux.CurrentProtection()
         self.string_cables = pv_aux.StringCables(self)
@@ -233,14 +673,80 @@ class SolarPanelMatrix:
         self.prot_max_str = 0   # max. permissible number of strings per protective device
         self.prot_str = 0       # number of strings per protective device to be set by user
 
+    @property
+    def matrix(self) -> np.ndarray:
+        """
+        Get the solar panels of the matrix as a 2D-array (row_num x col_num) of SolarPanel objects (or None if a
+        position is empty). Positions holding solar panels with the same configuration refer to the same object.
+        """
+        if self._matrix is None:
+            panels = np.empty(len(self._panel_types) + 1, dtype=object)
+            panels[:-1] = self._panel_types  # index -1 (empty position) refers to the last element, which is None
+            self._matrix = panels[self._cells]
+        return self._matrix
+
     def add_solar_panel(self, solar_panel: SolarPanel, i_row: int, i_col: int):
         if (0 <= i_row < self.row_num) and (0 <= i_col < self.col_num):
-            solar_panel = solar_panel.duplicate()
-            self.matrix[i_row][i_col] = solar_panel  # add solar panel to matrix
-            self._group_panel(solar_panel)  # add solar panel to horizon profile group
+            self._cells[i_row, i_col] = self._add_panel_type(solar_panel)
+            self._matrix = self._strings = None
+            self._operating_points = self._operating_point = None
         else:
             raise IndexError
 
+    def add_solar_panels(self, solar_panel: SolarPanel, i_rows=slice(None), i_cols=slice(None)):
+        """
+        Put the same solar panel at all positions in rows 'i_rows' and columns 'i_cols' at once. Rows and columns can
+        be given as a slice or a sequence of indexes; by default the whole matrix is filled.
+        """
+        rows = np.arange(self.row_num)[i_rows]
+        cols = np.arange(self.col_num)[i_cols]
+        self._cells[np.ix_(rows, cols)] = self._add_panel_type(solar_panel)
+        self._matrix = self._strings = None
+        self._operating_points = self._operating_point = None
+
+    @property
+    def panel_types(self) -> List[SolarPanel]:
+        """Get the (registered) panel types used in the matrix."""
+        return list(self._panel_types)
+
+    def _add_panel_type(self, solar_panel: SolarPanel) -> int:
+        # physically identical solar panels share one panel type (see PanelTypeRegistry)
+        panel_type = self.registry.register(solar_panel)
+        for i_type, panel_type_ in enumerate(self._panel_types):
+            if panel_type_ is panel_type:
+                return i_type
+        i_type = len(self._panel_types)
+        if i_type > np.iinfo(self._cells.dtype).max:
+            raise IndexError('too many different solar panel configurations in PV matrix')
+        self._panel_types.append(panel_type)
+        return i_type
+
+    def _get_type_counts(self) -> np.ndarray:
+        # number of solar panels of each panel type in the matrix
+        return np.bincount(self._cells[self._cells >= 0], minlength=len(self._panel_types))
+
+    def _get_strings(self) -> Tuple[np.ndarray, np.ndarray]:
+        # number of solar panels of each panel type in each different string (rows) and the number of strings in the
+        # matrix with that composition; empty strings are left out
+        if self._strings is None:
+            type_counts = np.stack(
+                [np.count_nonzero(self._cells == i_type, axis=0) for i_type in range(len(self._panel_types))],
+                axis=1
+            ).reshape(self.col_num, len(self._panel_types))
+            type_counts = type_counts[type_counts.sum(axis=1) > 0]
+            self._strings = np.unique(type_counts, axis=0, return_counts=True)
+        return self._strings
+
+    def _sum_string(self, type_values: np.ndarray) -> float:
+        # sum the values of the panel types along the solar panels in the first string (column) of the matrix
+        cells = self._cells[:, 0]
+        return float(np.sum(type_values[cells[cells >= 0]]))
+
+    def _sum_first_row(self, type_values: np.ndarray) -> float:
+        # sum the values of the panel types along the solar panels in the first row of the matrix
+        cells = self._cells[0, :]
+        return float(np.sum(type_values[cells[cells >= 0]]))
+
     def set_operating_conditions(
             self,
             date: Date = None,
@@ -250,86 +756,144 @@ class SolarPanelMatrix:
             Tcell: float = None,
             Tambient: float = None
     ):
-        # the operating conditions are only set to the first panel in each horizon profile group
-        # this is the index panel of each group
-        for panel_group in self._panel_groups.values():
-            try:
-                solar_panel = panel_group[0]
-            except IndexError:
-                pass
-            else:
-                solar_panel.set_operating_conditions(date, time, Gsurf, Gglh, Tcell, Tambient)
+        # the operating conditions are kept as operating points of the panel types in the matrix (see
+        # evaluate_operating_point(...)); the (shared) photovoltaic characteristics of the solar panels are not changed
+        ops = self._get_operating_points(date, time, Gsurf, Gglh, Tcell, Tambient, None)
+        self._operating_points = dict(zip(self._panel_types, ops))
+        self._operating_point = self.evaluate_operating_point(operating_points=self._operating_points)
+
+    def _get_operating_point(self) -> MatrixOperatingPoint:
+        # operating point of the matrix last set with set_operating_conditions(...); by default the matrix is at STC
+        if self._operating_point is None:
+            self.set_operating_conditions(Gsurf=1000.0, Tcell=25.0)
+        return self._operating_point
+
+    def _get_operating_points(self, date, time, Gsurf, Gglh, Tcell, Tambient, operating_points):
+        # operating point of each panel type in the matrix; panel types that were already evaluated are not evaluated
+        # again
+        ops = []
+        for panel_type in self._panel_types:
+            op = operating_points.get(panel_type) if operating_points is not None else None
+            if op is None:
+                op = panel_type.evaluate_operating_point(date, time, Gsurf, Gglh, Tcell, Tambient)
+            ops.append(op)
+        return ops
+
+    def evaluate_operating_point(
+            self,
+            date: Date = None,
+            time: Time = None,
+            Gsurf: float = None,
+            Gglh: float = None,
+            Tcell: float = None,
+            Tambient: float = None,
+            operating_points: Dict[SolarPanel, OperatingPoint] = None
+    ) -> MatrixOperatingPoint:
+        """
+        Get the working conditions of the PV matrix as an immutable MatrixOperatingPoint. The solar panels in the
+        matrix and their (shared) photovoltaic characteristics are left untouched, so different matrices can be
+        evaluated concurrently.
+        Operating points of the panel types that were already evaluated (see evaluate_panel_types(...)) can be
+        passed with parameter 'operating_points'; only missing panel types are then evaluated.
+        """
+        ops = self._get_operating_points(date, time, Gsurf, Gglh, Tcell, Tambient, operating_points)
+        counts = self._get_type_counts()
+        G, Isc, Voc, Impp, Vmpp, Pmpp = (np.array([getattr(op, f) for op in ops]) for f in (
+            'G', 'Isc', 'Voc', 'Impp', 'Vmpp', 'Pmpp'
+        ))
+        area = np.array([panel.area for panel in self._panel_types])
+        Prd = float(np.sum(G * area * counts))
+        if self.mpp_method == 'curve':
+            Vax, Iax, Pax = self._combine_characteristics(Isc, Voc, Impp, Vmpp)
+            i_mpp = np.argmax(Pax)
+            return MatrixOperatingPoint(
+                Prd=Prd,
+                Pmpp=float(Pax[i_mpp]),
+                Vmpp=float(Vax[i_mpp]),
+                Impp=float(Iax[i_mpp]),
+                Voc=float(Vax[-1]),
+                Isc=float(Iax[0])
+            )
+        return MatrixOperatingPoint(
+            Prd=Prd,
+            Pmpp=float(np.sum(Pmpp * counts)),
+            Vmpp=self._sum_string(Vmpp),
+            Impp=self._sum_first_row(Impp),
+            Voc=self._sum_string(Voc),
+            Isc=self._sum_first_row(Isc)
+        )
+
+    def evaluate_characteristics(
+            self,
+            date: Date = None,
+            time: Time = None,
+            Gsurf: float = None,
+            Gglh: float = None,
+            Tcell: float = None,
+            Tambient: float = None,
+            operating_points: Dict[SolarPanel, OperatingPoint] = None
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Get the V,I- and V,P-characteristic of the PV matrix as a tuple of a voltage, current and power axis. The
+        characteristic is combined from the V,I-characteristics of the panel types in each string, so strings with
+        solar panels under different operating conditions (e.g. partially shaded by a horizon profile) are taken into
+        account. The solar panels in the matrix are left untouched (see also evaluate_operating_point(...)).
+        """
+        ops = self._get_operating_points(date, time, Gsurf, Gglh, Tcell, Tambient, operating_points)
+        Isc, Voc, Impp, Vmpp = (np.array([getattr(op, f) for op in ops]) for f in ('Isc', 'Voc', 'Impp', 'Vmpp'))
+        return self._combine_characteristics(Isc, Voc, Impp, Vmpp)
+
+    def _combine_characteristics(
+            self,
+            Isc: np.ndarray,
+            Voc: np.ndarray,
+            Impp: np.ndarray,
+            Vmpp: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        # 1. the voltage of each panel type on a shared current axis; the voltages of the solar panels in a string
+        #    (connected in series) are added up
+        type_counts, string_counts = self._get_strings()
+        # near the short circuit current of each panel type the voltage falls steeply to zero: there the current axis
+        # is refined geometrically
+        Iax_str = np.unique(np.concatenate((
+            np.linspace(0.0, np.max(Isc, initial=0.0), self.n_points),
+            np.ravel(Isc[:, np.newaxis] * (1.0 - np.geomspace(1.0e-15, 1.0, self.n_points // 4)))
+        )))
+        Vax_types = PhotoVoltaicCharacteristics.calculate_voltages(
+            Iax_str, Isc[:, np.newaxis], Voc[:, np.newaxis], Impp[:, np.newaxis], Vmpp[:, np.newaxis]
+        )
+        # the voltage of a string cannot rise with the current (avoids a non-monotonic curve if Rpv < 0)
+        Vax_strings = np.minimum.accumulate(type_counts @ Vax_types, axis=1)
+        # 2. the current of each string on a shared voltage axis; the currents of the strings (connected in parallel)
+        #    are added up
+        Vax = np.linspace(0.0, np.max(Vax_strings, initial=0.0), self.n_points)
+        Iax = np.zeros(self.n_points)
+        for Vax_str, n in zip(Vax_strings, string_counts):
+            Iax += n * np.interp(Vax, Vax_str[::-1], Iax_str[::-1], right=0.0)
+        return Vax, Iax, Vax * Iax
 
     def get_solar_power(self):
-        Prd = 0.0
-        for panel_group in self._panel_groups.values():
-            try:
-                solar_panel = panel_group[0]
-            except IndexError:
-                pass
-            else:
-                Prd_panel = solar_panel.get_solar_power()
-                Prd_group = Prd_panel * len(panel_group)
-                Prd += Prd_group
-        return Prd
+        return self._get_operating_point().Prd
 
     def get_mpp_power(self):
-        Pmpp = 0.0
-        for panel_group in self._panel_groups.values():
-            try:
-                solar_panel = panel_group[0]
-            except IndexError:
-                pass
-            else:
-                Pmpp_panel = solar_panel.get_mpp_power()
-                Pmpp_group = Pmpp_panel * len(panel_group)
-                Pmpp += Pmpp_group
-        return Pmpp
+        return self._get_operating_point().Pmpp
 
     def get_mpp_voltage(self):
-        Vmpp = 0.0
-        for r in range(self.row_num):
-            solar_panel = self.matrix[r][0]
-            index_solar_panel = self._panel_groups[solar_panel.group][0]
-            Vmpp_index_solar_panel = index_solar_panel.get_mpp_voltage()
-            Vmpp += Vmpp_index_solar_panel
-        return Vmpp
+        return self._get_operating_point().Vmpp
 
     def get_mpp_current(self):
-        Impp = 0.0
-        for c in range(self.col_num):
-            solar_panel = self.matrix[0][c]
-            index_solar_panel = self._panel_groups[solar_panel.group][0]
-            Impp_index_solar_panel = index_solar_panel.get_mpp_current()
-            Impp += Impp_index_solar_panel
-        return Impp
+        return self._get_operating_point().Impp
 
     def get_oc_voltage(self):
-        Voc = 0.0
-        for r in range(self.row_num):
-            solar_panel = self.matrix[r][0]
-            index_solar_panel = self._panel_groups[solar_panel.group][0]
-            Voc_index_solar_panel = index_solar_panel.get_oc_voltage()
-            Voc += Voc_index_solar_panel
-        return Voc
+        return self._get_operating_point().Voc
 
     def get_sc_current(self):
-        Isc = 0.0
-        for c in range(self.col_num):
-            solar_panel = self.matrix[0][c]
-            index_solar_panel = self._panel_groups[solar_panel.group][0]
-            Isc_index_solar_panel = index_solar_panel.get_sc_current()
-            Isc += Isc_index_solar_panel
-        return Isc
+        return self._get_operating_point().Isc
 
     def get_characteristics(self):
-        solar_panel = self.matrix[0][0]
-        index_solar_panel = self._panel_groups[solar_panel.group][0]
-        Vax, Iax, Pax = index_solar_panel.pv_char.get_characteristics()
-        Vax = Vax * self.row_num
-        Iax = Iax * self.col_num
-        Pax = Vax * Iax
-        return Vax, Iax, Pax
+        # combined characteristic of the matrix at the operating conditions last set with set_operating_conditions(...)
+        self._get_operating_point()
+        return self.evaluate_characteristics(operating_points=self._operating_points)
 
     def get_max_reverse_current(self):
         solar_panel = self.matrix[0][0]
@@ -396,23 +960,6 @@ class SolarPanelMatrix:
         # if protective devices will be grouped, the maximum number of strings per protective device is determined from:
         self.prot_max_str = int((1 + solar_panel.pv_char.Irev_max // solar_panel.pv_char.stc.Isc) / 2.4)
 
-    def _group_panel(self, solar_panel: SolarPanel):
-        # put solar panels that have the same horizon profile in separate groups
-        if solar_panel.hz_profile:
-            if solar_panel.hz_profile.id not in self._panel_groups.keys():
-                # create new group
-                new_group = [solar_panel]
-                self._panel_groups[solar_panel.hz_profile.id] = new_group
-            else:
-                # add solar panel to existing group
-                self._panel_groups[solar_panel.hz_profile.id].append(solar_panel)
-            # each solar panel knows to which group it belongs
-            solar_panel.group = solar_panel.hz_profile.id
-        else:
-            # if solar panel has no horizon profile (None), put it in 'default' group
-            self._panel_groups['default'].append(solar_panel)
-            solar_panel.group = 'default'
-
 
 class Inverter:
     ERR_P_AC_NOM = "inverter nominal AC power out of limits"
@@ -438,6 +985,8 @@ class Inverter:
         self.eff_at_Vdc_nom = {}   # part load efficiencies at V_dc_nom
         self.eff_at_Vmpp_max = {}  # part load efficiencies at V_mpp_max
         self._eff_interpolants = []
+        self._eff_P_ax = None  # DC power axis of the precomputed part load efficiencies
+        self._eff_grid = None  # part load efficiencies at Vmpp_min, Vdc_nom and Vmpp_max along the DC power axis
 
         self.Tc_min = -10.0
         self.Tc_max = 70.0
@@ -461,15 +1010,13 @@ class Inverter:
 
     def get_maximum_string_size(self, pv_module: SolarPanel):
         """Get maximum allowable number of solar panels in one string."""
-        pv_module.pv_char.set_irradiance(pv_module.pv_char.stc.G)
-        pv_module.pv_char.set_cell_temperature(self.Tc_min)
-        return int(self.Vdc_max / pv_module.pv_char.awc.Voc)
+        op = pv_module.pv_char.evaluate(G=pv_module.pv_char.stc.G, Tc=self.Tc_min)
+        return int(self.Vdc_max / op.Voc)
 
     def get_minimum_string_size(self, pv_module: SolarPanel):
         """Get minimum allowable number of solar panels in one string."""
-        pv_module.pv_char.set_irradiance(pv_module.pv_char.stc.G)
-        pv_module.pv_char.set_cell_temperature(self.Tc_max)
-        return int(self.Vmpp_min / pv_module.pv_char.awc.Voc)
+        op = pv_module.pv_char.evaluate(G=pv_module.pv_char.stc.G, Tc=self.Tc_max)
+        return int(self.Vmpp_min / op.Voc)
 
     def get_maximum_number_of_strings(self, pv_module: SolarPanel):
         """
@@ -506,8 +1053,7 @@ class Inverter:
     def _required_ac_power_range(self):
         Ppv_peak = 0.0
         for pv_matrix in self.pv_matrices:
-            pv_matrix.set_operating_conditions(Tcell=25.0, Gsurf=1000.0)
-            Ppv_peak += pv_matrix.get_mpp_power()
+            Ppv_peak += pv_matrix.evaluate_operating_point(Tcell=25.0, Gsurf=1000.0).Pmpp
         return 0.8 * Ppv_peak, 1.2 * Ppv_peak
 
     def _check_max_input_voltage(self):
@@ -521,8 +1067,7 @@ class Inverter:
         # G = 1000.0, Tc = self.Tc_min
         req_Vdc_max = 0.0
         for pv_matrix in self.pv_matrices:
-            pv_matrix.set_operating_conditions(Tcell=self.Tc_min, Gsurf=1000.0)
-            Voc = pv_matrix.get_oc_voltage()
+            Voc = pv_matrix.evaluate_operating_point(Tcell=self.Tc_min, Gsurf=1000.0).Voc
             if Voc > req_Vdc_max:
                 req_Vdc_max = Voc
         return req_Vdc_max
@@ -539,10 +1084,8 @@ class Inverter:
         # G = self.Glow, Tc = self.Tc_Glow
         req_Vmpp_min = math.inf
         for pv_matrix in self.pv_matrices:
-            pv_matrix.set_operating_conditions(Tcell=self.Tc_max, Gsurf=1000.0)
-            Vmpp_Tmax = pv_matrix.get_mpp_voltage()
-            pv_matrix.set_operating_conditions(Tcell=self.Tc_Glow, Gsurf=self.Glow)
-            Vmpp_Tlg = pv_matrix.get_mpp_voltage()
+            Vmpp_Tmax = pv_matrix.evaluate_operating_point(Tcell=self.Tc_max, Gsurf=1000.0).Vmpp
+            Vmpp_Tlg = pv_matrix.evaluate_operating_point(Tcell=self.Tc_Glow, Gsurf=self.Glow).Vmpp
             Vmpp_min = min(Vmpp_Tmax, Vmpp_Tlg)
             if Vmpp_min < req_Vmpp_min:
                 req_Vmpp_min = Vmpp_min
@@ -558,8 +1101,7 @@ class Inverter:
     def _required_dc_current_limit(self):
         req_Idc_max = 0.0
         for pv_matrix in self.pv_matrices:
-            pv_matrix.set_operating_conditions(Tcell=25.0, Gsurf=1000.0)
-            Idc_max = 1.25 * pv_matrix.get_mpp_current()
+            Idc_max = 1.25 * pv_matrix.evaluate_operating_point(Tcell=25.0, Gsurf=1000.0).Impp
             if Idc_max > req_Idc_max:
                 req_Idc_max = Idc_max
         return req_Idc_max
@@ -574,8 +1116,7 @@ class Inverter:
     def _required_dc_power_limit(self):
         req_Pdc_max = 0.0
         for pv_matrix in self.pv_matrices:
-            pv_matrix.set_operating_conditions(Tcell=self.Tc_pl, Gsurf=1000.0)
-            req_Pdc_max += pv_matrix.get_mpp_power()
+            req_Pdc_max += pv_matrix.evaluate_operating_point(Tcell=self.Tc_pl, Gsurf=1000.0).Pmpp
         return req_Pdc_max
 
     def get_requirements(self) -> Dict[str, Tuple[float, str]]:
@@ -601,30 +1142,42 @@ class Inverter:
         self.eff_at_Vmpp_max = eff_at_Vmpp_max
         self._interpolate_efficiency()
 
-    def _interpolate_efficiency(self):
+    def _interpolate_efficiency(self, n_points: int = 1001):
         self._eff_interpolants = []
         for dict_ in (self.eff_at_Vmpp_min, self.eff_at_Vdc_nom, self.eff_at_Vmpp_max):
             P_ax = [(percent / 100.0) * self.Pdc_nom for percent in dict_.keys()]
             eff_ax = [eff / 100.0 for eff in dict_.values()]
             self._eff_interpolants.append(interpolation.CubicSplineInterPol(P_ax, eff_ax))
+        # the splines are evaluated once on a fine DC power axis; above 125 % of the nominal DC power (where the AC
+        # output is clipped at Pac_nom anyway) the efficiency is held constant
+        self._eff_P_ax = np.linspace(0.0, 1.25 * self.Pdc_nom, n_points)
+        self._eff_grid = np.array([[ip.solve(P) for P in self._eff_P_ax] for ip in self._eff_interpolants])
+
+    def _get_part_load_efficiencies(self, Pdc) -> np.ndarray:
+        # efficiencies at power(s) Pdc and at Vmpp_min, Vdc_nom and Vmpp_max of inverter (first axis)
+        return np.array([np.interp(Pdc, self._eff_P_ax, eff_ax) for eff_ax in self._eff_grid])
 
     def get_inverter_efficiency(self, Pdc, Vdc):
-        if self._eff_interpolants:
-            # efficiencies at power Pdc and at Vmpp_min, Vdc_nom and Vmpp_max of inverter
-            eff = [ip.solve(Pdc) for ip in self._eff_interpolants]
-            # interpolate efficiency = f(Vdc, Pdc=cst.) to find efficiency at Vdc
+        """
+        Get the inverter efficiency at DC input power 'Pdc' [W] and DC input voltage 'Vdc' [V]. Both can be floats or
+        NumPy arrays (which are broadcast against each other).
+        """
+        if self._eff_grid is not None:
+            eff = self._get_part_load_efficiencies(Pdc)
+            # interpolate efficiency = f(Vdc, Pdc=cst.) to find efficiency at Vdc: quadratic Lagrange polynomial
+            # through the efficiencies at Vmpp_min, Vdc_nom and Vmpp_max
             V = [self.Vmpp_min, self.Vdc_nom, self.Vmpp_max]
-            ip = interpolation.PolyInterPol(V, eff, method='neville')
-            eff = ip.solve(Vdc)
-        else:
-            eff = self.eff_avg / 100.0
-        return eff
+            Vdc = np.asarray(Vdc, dtype=np.float64)
+            eff = sum(
+                eff[i] * (Vdc - V[j]) * (Vdc - V[k]) / ((V[i] - V[j]) * (V[i] - V[k]))
+                for i, j, k in ((0, 1, 2), (1, 0, 2), (2, 0, 1))
+            )
+            return float(eff) if np.ndim(eff) == 0 else eff
+        return self.eff_avg / 100.0
 
     def plot_efficiency_curves(self, fig_size=None, dpi=None):
         P_ax = np.linspace(0.05 * self.Pdc_nom, self.Pdc_nom, endpoint=True)
-        eff_ax_at_Vmpp_min = np.array([self._eff_interpolants[0].solve(P) for P in P_ax]) * 100.0
-        eff_ax_at_Vdc_nom = np.array([self._eff_interpolants[1].solve(P) for P in P_ax]) * 100.0
-        eff_ax_at_Vmpp_max = np.array([self._eff_interpolants[2].solve(P) for P in P_ax]) * 100.0
+        eff_ax_at_Vmpp_min, eff_ax_at_Vdc_nom, eff_ax_at_Vmpp_max = self._get_part_load_efficiencies(P_ax) * 100.0
         graph = graphing.Graph(fig_size=fig_size, dpi=dpi)
         graph.add_data_set(f'eff @ Vmpp_min = {self.Vmpp_min} V', P_ax, eff_ax_at_Vmpp_min)
         graph.add_data_set(f'eff @ Vdc_nom = {self.Vdc_nom} V', P_ax, eff_ax_at_Vdc_nom)
@@ -640,6 +1193,12 @@ class Inverter:
         Pac = eff * Pdc
         return Pac if Pac < self.Pac_nom else self.Pac_nom
 
+    def get_ac_power_array(self, Pdc: np.ndarray, Vdc: np.ndarray) -> np.ndarray:
+        """Same as get_ac_power(...), but for arrays of DC input power 'Pdc' [W] and DC input voltage 'Vdc' [V]."""
+        Pdc = np.asarray(Pdc, dtype=np.float64)
+        Pac = self.get_inverter_efficiency(Pdc, Vdc) * Pdc
+        return np.minimum(Pac, self.Pac_nom)
+
     def plot_working_range(self, required_range=False, pv_matrix_id=None, fig_size=None, dpi=None):
         # minimum voltage limit
         Vmpp_min = self.Vmpp_min if not required_range else self._required_min_mpp_voltage()
@@ -1,9 +1,13 @@
+import collections
+import os
+
 import numpy as np
 import pandas as pd
 
 from sun.geometry import SunPositionCalculator
 from photovoltaic.datafetch import TMYDataFetcher, CLPDataFetcher
 from photovoltaic.auxiliary_components import Battery
+from photovoltaic.main_components import calculate_irradiances, get_unique_panel_types
 from nummath import interpolation, integration, graphing
 from quantities.date_time import DateTime, Date, Time, ANY_YEAR
 
@@ -85,26 +89,45 @@ class DailyYield:
             self.inv_container[inverter.id] = inv_box
 
     def _calculate_powers(self):
-        for t, Gglh, T in zip(self.t_ax, self.Gglh_ax, self.T_ax):
+        # physically identical panel types in different PV matrices are evaluated only once per time step
+        panel_types = get_unique_panel_types(
+            panel_type
+            for inverter in self.inverters
+            for pv_matrix in inverter.pv_matrices
+            for panel_type in pv_matrix.panel_types
+        )
+        unique_types = list(dict.fromkeys(panel_types.values()))
+        # irradiance on each panel type during the whole day at once
+        datetimes = np.array([DateTime(date=self.date, time=t).py_datetime for t in self.t_ax], dtype='datetime64[s]')
+        G = calculate_irradiances(unique_types, datetimes, self.Gglh_ax)
+        Vdc_ax = {inverter.id: [] for inverter in self.inverters}
+        for j, T in enumerate(self.T_ax):
+            unique_ops = {
+                panel_type: panel_type.evaluate_operating_point(Gsurf=G[i, j], Tambient=T)
+                for i, panel_type in enumerate(unique_types)
+            }
+            ops = {panel_type: unique_ops[unique_type] for panel_type, unique_type in panel_types.items()}
             for inverter in self.inverters:
                 Pin = 0.0; Vdc = []
                 for pv_matrix in inverter.pv_matrices:
-                    pv_matrix.set_operating_conditions(date=self.date, time=t, Gglh=Gglh, Tambient=T)
-                    Prd = pv_matrix.get_solar_power()
-                    self.pvm_container[pv_matrix.id]['Prd_ax'].append(Prd)
-                    Pmpp = pv_matrix.get_mpp_power()
-                    self.pvm_container[pv_matrix.id]['Pmpp_ax'].append(Pmpp)
-                    Vmpp = pv_matrix.get_mpp_voltage()
-                    Plo = pv_matrix.string_cables.get_power_loss()
-                    Vlo = pv_matrix.string_cables.get_voltage_drop()
-                    Pout = Pmpp - Plo  # output from matrix
+                    # operating point snapshot: the PV matrix and its solar panels are not modified
+                    op = pv_matrix.evaluate_operating_point(operating_points=ops)
+                    self.pvm_container[pv_matrix.id]['Prd_ax'].append(op.Prd)
+                    self.pvm_container[pv_matrix.id]['Pmpp_ax'].append(op.Pmpp)
+                    Istr = op.Impp / pv_matrix.col_num  # average string current
+                    Plo = pv_matrix.string_cables.calc_power_loss(Istr)
+                    Vlo = pv_matrix.string_cables.calc_voltage_drop(Istr)
+                    Pout = op.Pmpp - Plo  # output from matrix
                     self.pvm_container[pv_matrix.id]['Pout_ax'].append(Pout)
                     Pin += Pout  # total input at inverter
-                    Vdc.append(Vmpp - Vlo)
+                    Vdc.append(op.Vmpp - Vlo)
                 Vdc_avg = sum(Vdc) / len(Vdc)  # average Vdc across inverter inputs
-                Pout = inverter.get_ac_power(Pin, Vdc_avg)  # total output at inverter
                 self.inv_container[inverter.id]['Pin_ax'].append(Pin)
-                self.inv_container[inverter.id]['Pout_ax'].append(Pout)
+                Vdc_ax[inverter.id].append(Vdc_avg)
+        # total output at inverter, for the whole day at once
+        for inverter in self.inverters:
+            inv_box = self.inv_container[inverter.id]
+            inv_box['Pout_ax'] = inverter.get_ac_power_array(inv_box['Pin_ax'], Vdc_ax[inverter.id]).tolist()
 
     def _calculate_interpolants(self):
         for pvm_box in self.pvm_container.values():
@@ -147,10 +170,27 @@ class DailyYield:
         return integrator.solve()[0] / 1000.0  # kWh
 
 
+def _analyze_daily_yield(dyo: DailyYield) -> DailyYield:
+    # module level function, so it can be sent to the workers of a process pool
+    dyo.analyze()
+    return dyo
+
+
 class AnnualYield:
     """Class for performing PV yield analysis between a start and end date (end date included)."""
 
-    def __init__(self, TMY_file, location, pv_inverters):
+    def __init__(self, TMY_file, location, pv_inverters, stream=False):
+        # with stream=True the TMY file is read one day at a time whenever the days are needed, so that the DailyYield
+        # objects of the whole file are never held in memory at once
+        self.stream = stream
+        self.df = None
+        if stream:
+            self._TMY_file = TMY_file
+            self._location = location
+            self._pv_inverters = pv_inverters
+            self.dyo_container = None
+            return
+
         # get daily TMY datasets
         tmy = TMYDataFetcher(TMY_file, tz_str=location.timezone)
         tmy_data = tmy.get_daily_datasets()
@@ -161,10 +201,24 @@ class AnnualYield:
             for dataset in tmy_data
         }
 
-        self.df = None
+    def _stream_daily_yields(self, start_date, end_date):
+        tmy_data = TMYDataFetcher.iter_daily_datasets(self._TMY_file, tz_str=self._location.timezone)
+        # the datasets come in date order, so the rest of the file is not read once 'end_date' is passed
+        for dataset in tmy_data:
+            if dataset['date'].py_date > end_date.py_date:
+                break
+            if dataset['date'].py_date >= start_date.py_date:
+                yield DailyYield(dataset, self._pv_inverters)
 
     def get_daily_yields(self, start_date, end_date=None):
         """Return DailyYield objects between start date and end date (included)."""
+        if self.stream:
+            if not end_date:
+                dyo = next(self._stream_daily_yields(start_date, start_date), None)
+                if dyo is None:
+                    raise KeyError(str(start_date))
+                return dyo
+            return self._stream_daily_yields(start_date, end_date)
         if not end_date:
             return self.dyo_container[str(start_date)]
         else:
@@ -174,9 +228,39 @@ class AnnualYield:
             selected_dates = all_dates[i_start:i_end+1]
             return (self.dyo_container[date] for date in selected_dates)
 
-    def analyze(self, start_date: Date, end_date: Date):
+    def iter_analyzed(self, start_date: Date, end_date: Date, executor=None, window: int = None):
+        """
+        Generator that yields the analyzed DailyYield objects between start and end date included, one at a time.
+        The days are independent of each other: if a concurrent.futures Executor is passed with parameter 'executor',
+        the days are analyzed in parallel by the workers of this thread or process pool. At most 'window' days are
+        submitted to the executor at once (by default twice the number of CPUs), so that in stream mode only these
+        days are held in memory.
+        """
+        dyo_gen = self.get_daily_yields(start_date, end_date)
+        if executor is None:
+            yield from map(_analyze_daily_yield, dyo_gen)
+            return
+        if window is None:
+            window = 2 * (os.cpu_count() or 1)
+        pending = collections.deque()
+        for dyo in dyo_gen:
+            pending.append(executor.submit(_analyze_daily_yield, dyo))
+            if len(pending) >= window:
+                yield self._collect_analyzed(pending.popleft().result())
+        while pending:
+            yield self._collect_analyzed(pending.popleft().result())
+
+    def _collect_analyzed(self, dyo: DailyYield) -> DailyYield:
+        # a process pool returns analyzed copies of the DailyYield objects
+        if not self.stream:
+            self.dyo_container[str(dyo.date)] = dyo
+        return dyo
+
+    def analyze(self, start_date: Date, end_date: Date, executor=None):
         """
         Calculate daily amount of energies for every day between start and end date included.
+        The days are independent of each other: if a concurrent.futures Executor is passed with parameter 'executor',
+        the days are analyzed in parallel by the workers of this thread or process pool.
         These energies are:
             - incident solar energy
             - generated photovoltaic energy
@@ -190,19 +274,21 @@ class AnnualYield:
             - the maximum energy amounts
         """
 
-        dyo_list = list(self.get_daily_yields(start_date, end_date))
-
-        for dyo in dyo_list:
-            dyo.analyze()
-
+        data = []
+        index = []
+        for dyo in self.iter_analyzed(start_date, end_date, executor):
+            data.append(dyo.get_energies())
+            index.append(str(dyo.date))
+        return self.set_results(data, index)
+
+    def set_results(self, data, index):
+        """Put the daily energies (list of DailyYield.get_energies()) in self.df and return the statistics."""
         # put all daily energies in a DataFrame
         #   - Erd = total solar energy between start and end date
         #   - Empp = total photovoltaic energy produced by solar panels
         #   - Ein = total DC energy input at inverters
         #   - Eout = total AC energy output of inverters
         columns = ['Erd', 'Empp', 'Ein', 'Eout']
-        data = [dyo.get_energies() for dyo in dyo_list]
-        index = [str(dyo.date) for dyo in dyo_list]
         self.df = pd.DataFrame(data=data, index=index, columns=columns)
         # get the sum of each column, the minimum and maximum value in each column and the average of each column
         sum_ = self.df.sum(axis=0)
@@ -268,9 +354,17 @@ class DailyLoad:
 class AnnualLoad:
     """Class for performing load analysis between a start and end date (end date included)."""
 
-    def __init__(self, CLP_file, location, Ean=1.0):
+    def __init__(self, CLP_file, location, Ean=1.0, stream=False):
         self.loc = location
         self.Ean = Ean  # annual energy consumption (if > 1.0, CLP-file contains synthetic load profile)
+        # with stream=True the CLP file is read one day at a time whenever the days are needed, so that the DailyLoad
+        # objects of the whole file are never held in memory at once
+        self.stream = stream
+        self.df = None
+        if stream:
+            self._CLP_file = CLP_file
+            self.dlo_container = None
+            return
         clp = CLPDataFetcher(CLP_file, tz_str=self.loc.timezone)
         CLP_data = clp.get_daily_datasets()
 
@@ -280,10 +374,24 @@ class AnnualLoad:
             for dataset in CLP_data
         }
 
-        self.df = None
+    def _stream_daily_loads(self, start_date, end_date):
+        CLP_data = CLPDataFetcher.iter_daily_datasets(self._CLP_file, tz_str=self.loc.timezone)
+        # the datasets come in date order, so the rest of the file is not read once 'end_date' is passed
+        for dataset in CLP_data:
+            if dataset['date'].py_date > end_date.py_date:
+                break
+            if dataset['date'].py_date >= start_date.py_date:
+                yield DailyLoad(dataset, self.loc, self.Ean)
 
     def get_daily_loads(self, start_date, end_date=None):
         """Return DailyLoad objects between start date and end date (included)."""
+        if self.stream:
+            if not end_date:
+                dlo = next(self._stream_daily_loads(start_date, start_date), None)
+                if dlo is None:
+                    raise KeyError(str(start_date))
+                return dlo
+            return self._stream_daily_loads(start_date, end_date)
         if not end_date:
             return self.dlo_container[str(start_date)]
         else:
@@ -304,19 +412,26 @@ class AnnualLoad:
             - the average energy amounts
             - the maximum energy amounts
         """
-        dlo_list = list(self.get_daily_loads(start_date, end_date))
-
-        # analyze DailyLoad-objects between start and end date (included)
-        for dlo in dlo_list:
+        data = []
+        index = []
+        for dlo in self.iter_analyzed(start_date, end_date):
+            data.append(dlo.get_energies())
+            index.append(str(dlo.date))
+        return self.set_results(data, index)
+
+    def iter_analyzed(self, start_date, end_date):
+        """Generator that yields the analyzed DailyLoad objects between start and end date included, one at a time."""
+        for dlo in self.get_daily_loads(start_date, end_date):
             dlo.analyze()
+            yield dlo
 
+    def set_results(self, data, index):
+        """Put the daily energies (list of DailyLoad.get_energies()) in self.df and return the statistics."""
         # put all daily energies in a DataFrame
         #   - Etot = total energy consumption
         #   - Edt = daytime energy consumption
         #   - Ent = nighttime energy consumption
         columns = ['Etot', 'Edt', 'Ent']
-        data = [dlo.get_energies() for dlo in dlo_list]
-        index = [str(dlo.date) for dlo in dlo_list]
         self.df = pd.DataFrame(data=data, index=index, columns=columns)
         # get the sum of each column, the minimum and maximum in each column and the average of each column
         sum_ = self.df.sum(axis=0)
@@ -329,9 +444,12 @@ class AnnualLoad:
 class EnergyAnalyzer:
     """Class for performing PV yield and load analysis."""
 
-    def __init__(self, TMY_file, CLP_file, location, pv_inverters, Ean=1.0):
-        self.ay = AnnualYield(TMY_file, location, pv_inverters)
-        self.al = AnnualLoad(CLP_file, location, Ean)  # Ean = annual energy consumption
+    def __init__(self, TMY_file, CLP_file, location, pv_inverters, Ean=1.0, stream=False):
+        # with stream=True the TMY and CLP files are read one day at a time (see AnnualYield and AnnualLoad) and
+        # analyze() handles each day completely before reading the next one
+        self.stream = stream
+        self.ay = AnnualYield(TMY_file, location, pv_inverters, stream)
+        self.al = AnnualLoad(CLP_file, location, Ean, stream)  # Ean = annual energy consumption
         self._location = location
         self.battery = None
         
@@ -351,18 +469,26 @@ class EnergyAnalyzer:
         self.Eload_stats = None  # load stats: sum, min, avg and max of Etot, Edt, Ent
         self.Eflow_stats = None  # energy flow stats: sum, min, avg and max of EgtL, Eptg, Eptl, Eptb and Ebtl
 
-    def analyze(self, start_date=None, end_date=None):
-        """Perform energy analysis: PV yield analysis, load consumption analysis and energy flow analysis."""
+    def analyze(self, start_date=None, end_date=None, executor=None):
+        """
+        Perform energy analysis: PV yield analysis, load consumption analysis and energy flow analysis.
+        The PV yield analysis of the individual days can be distributed over a thread or process pool by passing a
+        concurrent.futures Executor with parameter 'executor'.
+        """
         if not start_date or not end_date:
             start_date = Date(ANY_YEAR, 1, 1)
             end_date = Date(ANY_YEAR, 12, 31)
 
+        if self.stream:
+            self._analyze_stream(start_date, end_date, executor)
+            return
+
         # 1. analyze AnnualYield: self.Eyield_stats contains:
         # self.Ey_stats['tot'][<'Erd' | 'Empp' | 'Ein' | 'Eout'>] = total between start and end date
         # self.Ey_stats['min'][<'Erd' | 'Empp' | 'Ein' | 'Eout'>] = minimum
         # self.Ey_stats['avg'][<'Erd' | 'Empp' | 'Ein' | 'Eout'>] = average
         # self.Ey_stats['max'][<'Erd' | 'Empp' | 'Ein' | 'Eout'>] = maximum
-        self.Eyield_stats = self.ay.analyze(start_date, end_date)
+        self.Eyield_stats = self.ay.analyze(start_date, end_date, executor)
 
         # 2. analyze AnnualLoad: self.Eload_stats contains:
         # self.El_stats['tot'][<'Etot' | 'Edt' | 'Ent'>] = total Etot, Edt or Ent between start and end date
@@ -384,15 +510,37 @@ class EnergyAnalyzer:
             start_date = Date(ANY_YEAR, 1, 1)
             end_date = Date(ANY_YEAR, 12, 31)
 
-        dyo_gen = self.ay.get_daily_yields(start_date, end_date)
-        dlo_gen = self.al.get_daily_loads(start_date, end_date)
+        if self.stream:
+            # the days that are read from the files still need to be analyzed
+            dyo_gen = self.ay.iter_analyzed(start_date, end_date)
+            dlo_gen = self.al.iter_analyzed(start_date, end_date)
+        else:
+            dyo_gen = self.ay.get_daily_yields(start_date, end_date)
+            dlo_gen = self.al.get_daily_loads(start_date, end_date)
 
         # analyze and collect daily energy flows
         data = []
         for dyo, dlo in zip(dyo_gen, dlo_gen):
             row = self._analyze(dyo, dlo)
             data.append(row)
-
+        return self._set_energy_flows(data)
+
+    def _analyze_stream(self, start_date, end_date, executor=None):
+        # PV yield, load and energy flow analysis in one pass over the days, so that only one day (or with an executor,
+        # the days submitted to it; see AnnualYield.iter_analyzed(...)) is held in memory
+        yield_data, load_data, flow_data, index = [], [], [], []
+        dyo_gen = self.ay.iter_analyzed(start_date, end_date, executor)
+        dlo_gen = self.al.iter_analyzed(start_date, end_date)
+        for dyo, dlo in zip(dyo_gen, dlo_gen):
+            yield_data.append(dyo.get_energies())
+            load_data.append(dlo.get_energies())
+            flow_data.append(self._analyze(dyo, dlo))
+            index.append(str(dyo.date))
+        self.Eyield_stats = self.ay.set_results(yield_data, index)
+        self.Eload_stats = self.al.set_results(load_data, index)
+        self.Eflow_stats = self._set_energy_flows(flow_data)
+
+    def _set_energy_flows(self, data):
         # create DataFrame with daily energy flows
         self.E_ddf = pd.DataFrame(data=np.array(data), columns=self.columns)
 
@@ -738,7 +886,12 @@ class EnergyAnalyzer:
 
         # get time and power axis of every DailyYield-object from start to end date
         Yt_ax = []; YPac_ax = []
-        for dyo in self.ay.get_daily_yields(start_date, end_date):
+        if self.stream:
+            # the days that are read from the file still need to be analyzed
+            dyo_gen = self.ay.iter_analyzed(start_date, end_date)
+        else:
+            dyo_gen = self.ay.get_daily_yields(start_date, end_date)
+        for dyo in dyo_gen:
             d = dyo.date
             t_ax_ = []; Pac_ax_ = []
             for t, Pac in dyo.ac_power_coords():
@@ -1,5 +1,7 @@
 import datetime
+import operator
 
+import numpy as np
 import pytz
 import matplotlib.dates
 
@@ -7,146 +9,185 @@ import matplotlib.dates
 ANY_YEAR = datetime.datetime.today().year
 
 
+_EPOCH = datetime.datetime(1970, 1, 1)
+_EPOCH_ORDINAL = _EPOCH.toordinal()
+_SECONDS_PER_DAY = 86400
+# seconds since the epoch of ANY_YEAR-01-01 00:00:00 (the date of Time objects)
+_ANY_YEAR_START = (datetime.date(ANY_YEAR, 1, 1).toordinal() - _EPOCH_ORDINAL) * _SECONDS_PER_DAY
+
+
+def _date_to_seconds(year, month, day):
+    # seconds since the epoch (1970-01-01 00:00:00) of the start of a date; datetime.date checks the date
+    return (datetime.date(year, month, day).toordinal() - _EPOCH_ORDINAL) * _SECONDS_PER_DAY
+
+
+def _time_to_seconds(hour, minute, second):
+    # seconds since midnight of a time of the day; same checks and messages as datetime.time
+    hour, minute, second = operator.index(hour), operator.index(minute), operator.index(second)
+    if not 0 <= hour <= 23:
+        raise ValueError('hour must be in 0..23')
+    if not 0 <= minute <= 59:
+        raise ValueError('minute must be in 0..59')
+    if not 0 <= second <= 59:
+        raise ValueError('second must be in 0..59')
+    return hour * 3600 + minute * 60 + second
+
+
+def _py_datetime_to_seconds(py_datetime):
+    # seconds since the epoch of a Python datetime (fractions of a second are dropped)
+    return (
+        (py_datetime.toordinal() - _EPOCH_ORDINAL) * _SECONDS_PER_DAY
+        + py_datetime.hour * 3600 + py_datetime.minute * 60 + py_datetime.second
+    )
+
+
 class DateTime:
+    """
+    Date and time of the day without time zone, stored as a whole number of seconds since 1970-01-01 00:00:00. The
+    Python datetime object is only created the first time it is asked for (directly or through one of the fields of
+    the date and time) and is then kept with the object.
+    """
+    __slots__ = ('_seconds', '_py_datetime')
+
     def __init__(self, date: 'Date' = None, time: 'Time' = None, **kwargs):
+        self._py_datetime = None
         if date and time:
-            self._year = date.year
-            self._month = date.month
-            self._day = date.day
-            self._hour = time.hour
-            self._minute = time.minute
-            self._second = time.second
+            self._seconds = date._day_seconds() + time._time_seconds()
         elif set(kwargs.keys()).issubset({'year', 'month', 'day', 'hour', 'minute', 'second'}):
-            self._year = kwargs.get('year', ANY_YEAR)
-            self._month = kwargs.get('month', 1)
-            self._day = kwargs.get('day', 1)
-            self._hour = kwargs.get('hour', 0)
-            self._minute = kwargs.get('minute', 0)
-            self._second = kwargs.get('second', 0)
+            self._seconds = (
+                _date_to_seconds(kwargs.get('year', ANY_YEAR), kwargs.get('month', 1), kwargs.get('day', 1))
+                + _time_to_seconds(kwargs.get('hour', 0), kwargs.get('minute', 0), kwargs.get('second', 0))
+            )
         else:
-            self._year = ANY_YEAR
-            self._month = 1
-            self._day = 1
-            self._hour = 0
-            self._minute = 0
-            self._second = 0
-
-        self._py_datetime = datetime.datetime(
-            year=self._year,
-            month=self._month,
-            day=self._day,
-            hour=self._hour,
-            minute=self._minute,
-            second=self._second
-        )
+            self._seconds = _ANY_YEAR_START
+
+    @classmethod
+    def _from_seconds(cls, seconds: int):
+        obj = cls.__new__(cls)
+        obj._seconds = seconds
+        obj._py_datetime = None
+        return obj
+
+    def _day_seconds(self):
+        # seconds since the epoch of the start of the day
+        return self._seconds - self._seconds % _SECONDS_PER_DAY
+
+    def _time_seconds(self):
+        # seconds since midnight
+        return self._seconds % _SECONDS_PER_DAY
+
+    def _replace(self, **kwargs):
+        self._py_datetime = self.py_datetime.replace(**kwargs)
+        self._seconds = _py_datetime_to_seconds(self._py_datetime)
 
     @property
     def year(self):
-        return self._year
+        return (self._py_datetime or self.py_datetime).year
 
     @year.setter
     def year(self, year: int):
-        self._year = year
-        self._py_datetime = self._py_datetime.replace(year=year)
+        self._replace(year=year)
 
     @property
     def month(self):
-        return self._month
+        return (self._py_datetime or self.py_datetime).month
 
     @month.setter
     def month(self, month: int):
-        self._month = month
-        self._py_datetime = self._py_datetime.replace(month=month)
+        self._replace(month=month)
 
     @property
     def day(self):
-        return self._day
+        return (self._py_datetime or self.py_datetime).day
 
     @day.setter
     def day(self, day: int):
-        self._day = day
-        self._py_datetime = self._py_datetime.replace(day=day)
+        self._replace(day=day)
 
     @property
     def hour(self):
-        return self._hour
+        return (self._py_datetime or self.py_datetime).hour
 
     @hour.setter
     def hour(self, hour: int):
-        self._hour = hour
-        self._py_datetime = self._py_datetime.replace(hour=hour)
+        self._replace(hour=hour)
 
     @property
     def minute(self):
-        return self._minute
+        return (self._py_datetime or self.py_datetime).minute
 
     @minute.setter
     def minute(self, minute: int):
-        self._minute = minute
-        self._py_datetime = self._py_datetime.replace(minute=minute)
+        self._replace(minute=minute)
 
     @property
     def second(self):
-        return self._second
+        return (self._py_datetime or self.py_datetime).second
 
     @second.setter
     def second(self, second: int):
-        self._second = second
-        self._py_datetime = self._py_datetime.replace(second=second)
+        self._replace(second=second)
+
+    @property
+    def epoch_seconds(self):
+        return self._seconds
 
     @property
     def py_datetime(self):
-        return self._py_datetime
+        py_datetime = self._py_datetime
+        if py_datetime is None:
+            py_datetime = self._py_datetime = _EPOCH + datetime.timedelta(seconds=self._seconds)
+        return py_datetime
+
+    @property
+    def py_date(self):
+        return self.py_datetime.date()
+
+    @property
+    def py_time(self):
+        return self.py_datetime.time()
+
+    def _time_str(self):
+        return self.py_datetime.strftime('%H:%M:%S')
+
+    def _date_str(self):
+        py_datetime = self.py_datetime
+        if py_datetime.year == ANY_YEAR:
+            return py_datetime.strftime('%d/%m')
+        return py_datetime.strftime('%d/%m/%Y')
 
     def __str__(self):
-        if self._year == ANY_YEAR:
-            return self._py_datetime.strftime('%d/%m %H:%M:%S')
-        else:
-            return self._py_datetime.strftime('%d/%m/%Y %H:%M:%S')
+        py_datetime = self.py_datetime
+        if py_datetime.year == ANY_YEAR:
+            return py_datetime.strftime('%d/%m %H:%M:%S')
+        return py_datetime.strftime('%d/%m/%Y %H:%M:%S')
 
     def convert_to_utc(self, timezone_str):
         # create pytz TimeZone object
         timezone = pytz.timezone(timezone_str)
         # assign naive datetime to local timezone to get local datetime
-        loc_datetime = timezone.localize(self._py_datetime, is_dst=True)
+        loc_datetime = timezone.localize(self.py_datetime, is_dst=True)
         # convert local datetime to UTC datetime
         utc_datetime = loc_datetime.astimezone(pytz.utc)
-        return self.__class__(
-            year=utc_datetime.year,
-            month=utc_datetime.month,
-            day=utc_datetime.day,
-            hour=utc_datetime.hour,
-            minute=utc_datetime.minute,
-            second=utc_datetime.second
-        )
+        return self.__class__.from_py_datetime(utc_datetime)
 
     def convert_to_lt(self, timezone_str):
         # create pytz TimeZone object
         timezone = pytz.timezone(timezone_str)
         # assign naive datetime to UTC, then convert UTC datetime to local datetime
-        loc_datetime = pytz.utc.localize(self._py_datetime, is_dst=True).astimezone(timezone)
-        return self.__class__(
-            year=loc_datetime.year,
-            month=loc_datetime.month,
-            day=loc_datetime.day,
-            hour=loc_datetime.hour,
-            minute=loc_datetime.minute,
-            second=loc_datetime.second
-        )
+        loc_datetime = pytz.utc.localize(self.py_datetime, is_dst=True).astimezone(timezone)
+        return self.__class__.from_py_datetime(loc_datetime)
 
     def convert_to_mpl_datetime(self):
-        return matplotlib.dates.date2num(self._py_datetime)
+        return matplotlib.dates.date2num(self.py_datetime)
 
     @classmethod
     def from_py_datetime(cls, py_datetime: datetime.datetime):
-        return cls(
-            year=py_datetime.year,
-            month=py_datetime.month,
-            day=py_datetime.day,
-            hour=py_datetime.hour,
-            minute=py_datetime.minute,
-            second=py_datetime.second
-        )
+        return cls._from_seconds(_py_datetime_to_seconds(py_datetime))
+
+    @classmethod
+    def from_epoch_seconds(cls, seconds: int):
+        return cls._from_seconds(int(seconds))
 
     @classmethod
     def from_datetime_str(cls, datetime_str, datetime_fmt_str='%d/%m/%Y %H:%M:%S'):
@@ -155,68 +196,60 @@ class DateTime:
 
     @property
     def time(self):
-        return Time(self._hour, self._minute, self._second)
+        return Time._from_seconds(_ANY_YEAR_START + self._time_seconds())
 
     @property
     def date(self):
-        return Date(self._year, self._month, self._day)
+        return Date._from_seconds(self._day_seconds())
 
     def __eq__(self, other):
         if isinstance(other, DateTime):
-            return self._py_datetime == other._py_datetime
+            return self._seconds == other._seconds
         return NotImplemented
 
 
 class Date(DateTime):
+    __slots__ = ()
+
     def __init__(self, year, month, day):
-        super().__init__(year=year, month=month, day=day)
-        self._py_date = self._py_datetime.date()
+        self._seconds = _date_to_seconds(year, month, day)
+        self._py_datetime = None
 
     def __str__(self):
-        if self._year == ANY_YEAR:
-            return self._py_date.strftime('%d/%m')
-        else:
-            return self._py_date.strftime('%d/%m/%Y')
-
-    @property
-    def py_date(self):
-        return self._py_datetime.date()
+        return self._date_str()
 
     @property
     def day_number(self):
-        dt = self._py_date - datetime.date(self._py_date.year, month=1, day=1)
-        return dt.days + 1
+        return self.py_date.timetuple().tm_yday
 
     @classmethod
     def from_py_datetime(cls, py_datetime: datetime.datetime):
-        return cls(py_datetime.year, py_datetime.month, py_datetime.day)
+        return cls._from_seconds(_py_datetime_to_seconds(py_datetime) // _SECONDS_PER_DAY * _SECONDS_PER_DAY)
 
     @classmethod
-    def from_datetime_str(cls, datetime_str, datetime_fmt_str='%d/%m/%Y %H:%M:%S'):
-        py_datetime = datetime.datetime.strptime(datetime_str, datetime_fmt_str)
-        return cls(py_datetime.year, py_datetime.month, py_datetime.day)
+    def from_epoch_seconds(cls, seconds: int):
+        return cls._from_seconds(int(seconds) // _SECONDS_PER_DAY * _SECONDS_PER_DAY)
 
     def __eq__(self, other):
         if isinstance(other, Date):
-            return self._py_date == other._py_date
+            return self._seconds // _SECONDS_PER_DAY == other._seconds // _SECONDS_PER_DAY
         return NotImplemented
 
 
 class Time(DateTime):
+    __slots__ = ()
+
     def __init__(self, hour, minute, second):
-        super().__init__(hour=hour, minute=minute, second=second)
-        self._py_time = self._py_datetime.time()
+        self._seconds = _ANY_YEAR_START + _time_to_seconds(hour, minute, second)
+        self._py_datetime = None
 
     def __str__(self):
-        return self._py_time.strftime('%H:%M:%S')
-
-    @property
-    def py_time(self):
-        return self._py_datetime.time()
+        return self._time_str()
 
     @property
     def as_decimal_hour(self):
-        return self._hour + self._minute / 60.0 + self._second / 3600.0
+        py_datetime = self._py_datetime or self.py_datetime
+        return py_datetime.hour + py_datetime.minute / 60.0 + py_datetime.second / 3600.0
 
     @classmethod
     def from_decimal_hour(cls, decimal_hour):
@@ -229,16 +262,15 @@ class Time(DateTime):
 
     @classmethod
     def from_py_datetime(cls, py_datetime: datetime.datetime):
-        return cls(py_datetime.hour, py_datetime.minute, py_datetime.second)
+        return cls._from_seconds(_ANY_YEAR_START + _py_datetime_to_seconds(py_datetime) % _SECONDS_PER_DAY)
 
     @classmethod
-    def from_datetime_str(cls, datetime_str, datetime_fmt_str='%d/%m/%Y %H:%M:%S'):
-        py_datetime = datetime.datetime.strptime(datetime_str, datetime_fmt_str)
-        return cls(py_datetime.hour, py_datetime.minute, py_datetime.second)
+    def from_epoch_seconds(cls, seconds: int):
+        return cls._from_seconds(_ANY_YEAR_START + int(seconds) % _SECONDS_PER_DAY)
 
     def __eq__(self, other):
         if isinstance(other, Time):
-            return self._py_time == other._py_time
+            return self._seconds % _SECONDS_PER_DAY == other._seconds % _SECONDS_PER_DAY
         return NotImplemented
 
 
@@ -254,3 +286,125 @@ class TimeDelta:
         minutes = int(seconds // 60)
         seconds = int(seconds % 60)
         self.tuple = (hours, minutes, seconds)
+
+
+# transitions of the time zones per year (see _get_year_transitions(...))
+_transition_tables = {}
+# time step [s] at which the UTC offset of a time zone is sampled to find its transitions
+_TRANSITION_SAMPLE_STEP = 6 * 3600
+
+
+def _get_year_transitions(timezone_str, year):
+    # UTC date-times (seconds since the epoch) in 'year' from which the UTC offset [s] and DST flag of the time zone
+    # change, preceded by the start of the year. They are found once per time zone and year with the public pytz API
+    # (the same conversion as DateTime.convert_to_lt(...)): the UTC offset is sampled every 6 hours, and where it
+    # changes, the second of the transition is found by bisection. So at most one transition every 6 hours is
+    # assumed, which holds for all time zones in the tz database.
+    key = (timezone_str, year)
+    if key not in _transition_tables:
+        timezone = pytz.timezone(timezone_str)
+
+        def get_state(seconds):
+            loc_datetime = pytz.utc.localize(_EPOCH + datetime.timedelta(seconds=seconds)).astimezone(timezone)
+            return int(loc_datetime.utcoffset().total_seconds()), bool(loc_datetime.dst())
+
+        start, end = _date_to_seconds(year, 1, 1), _date_to_seconds(year + 1, 1, 1)
+        transitions, states = [start], [get_state(start)]
+        previous = start
+        for sample in [*range(start + _TRANSITION_SAMPLE_STEP, end, _TRANSITION_SAMPLE_STEP), end - 1]:
+            while get_state(sample) != states[-1]:
+                # the state at 'low' is the last state found, the state at 'high' is not
+                low, high = previous, sample
+                while high - low > 1:
+                    middle = (low + high) // 2
+                    if get_state(middle) == states[-1]:
+                        low = middle
+                    else:
+                        high = middle
+                transitions.append(high)
+                states.append(get_state(high))
+                previous = high
+            previous = sample
+        _transition_tables[key] = (transitions, states)
+    return _transition_tables[key]
+
+
+def _get_transition_table(timezone_str, timestamps):
+    # UTC date-times (NumPy datetime64[s]) at which the UTC offset of the time zone changes, and the UTC offset [s]
+    # and DST flag of the time zone from each transition on, for the years of 'timestamps' and the years before and
+    # after (so that date-times can be shifted by some hours or days around the new year)
+    years = timestamps.astype('datetime64[Y]').astype(np.int64) + 1970 if timestamps.size else np.array([1970])
+    first_year = max(int(years.min()) - 1, datetime.MINYEAR)
+    last_year = min(int(years.max()) + 1, datetime.MAXYEAR - 1)
+    transitions, states = [], []
+    for year in range(first_year, last_year + 1):
+        year_transitions, year_states = _get_year_transitions(timezone_str, year)
+        transitions.extend(year_transitions)
+        states.extend(year_states)
+    offsets, dst = zip(*states)
+    return (
+        np.array(transitions, dtype=np.int64).astype('datetime64[s]'),
+        np.array(offsets, dtype=np.int64),
+        np.array(dst, dtype=bool)
+    )
+
+
+def _find_periods(transitions, timestamps):
+    # index of the transition that is in effect at each date-time (like pytz does with bisect_right)
+    return np.maximum(np.searchsorted(transitions, timestamps, side='right') - 1, 0)
+
+
+def convert_to_lt_array(timestamps, timezone_str):
+    """
+    Array version of DateTime.convert_to_lt(...): convert an array of naive UTC date-times (NumPy datetime64) to naive
+    local date-times (NumPy datetime64[s]) in time zone 'timezone_str'.
+    """
+    timestamps = np.asarray(timestamps, dtype='datetime64[s]')
+    transitions, offsets, _ = _get_transition_table(timezone_str, timestamps)
+    return timestamps + offsets[_find_periods(transitions, timestamps)].astype('timedelta64[s]')
+
+
+def convert_to_utc_array(timestamps, timezone_str, is_dst=True):
+    """
+    Array version of DateTime.convert_to_utc(...): convert an array of naive local date-times (NumPy datetime64) in
+    time zone 'timezone_str' to naive UTC date-times (NumPy datetime64[s]). Ambiguous and non-existent local times
+    around DST transitions are resolved the same way as pytz localize(..., is_dst) does: an ambiguous time is taken
+    in DST if 'is_dst' is True (as DateTime.convert_to_utc(...) does), else in standard time; a non-existent time is
+    shifted by the UTC offset of 6 hours later if 'is_dst' is True, else of 6 hours earlier.
+    """
+    timestamps = np.asarray(timestamps, dtype='datetime64[s]')
+    return timestamps - _get_utc_offsets(timestamps, timezone_str, is_dst).astype('timedelta64[s]')
+
+
+def _get_utc_offsets(timestamps, timezone_str, is_dst):
+    # UTC offsets [s] of naive local date-times
+    transitions, offsets, dst = _get_transition_table(timezone_str, timestamps)
+    one_day = np.timedelta64(1, 'D')
+    # like pytz, the possible UTC offsets are those in effect one day before and one day after the date-time; an
+    # offset is valid if converting back from UTC with that offset gives the same local date-time
+    candidates = [_find_periods(transitions, timestamps - one_day), _find_periods(transitions, timestamps + one_day)]
+    valid = [
+        offsets[_find_periods(transitions, timestamps - offsets[i].astype('timedelta64[s]'))] == offsets[i]
+        for i in candidates
+    ]
+    i_before, i_after = candidates
+    valid_before, valid_after = valid
+    ambiguous = valid_before & valid_after & (offsets[i_before] != offsets[i_after])
+    utc_offsets = np.where(valid_before, offsets[i_before], offsets[i_after])
+    if np.any(ambiguous):
+        # take the offset with the requested DST flag; if both or neither have it, take the earliest UTC date-time
+        # (i.e. the largest offset) if 'is_dst' is True, else the latest
+        dst_before = dst[i_before] == is_dst
+        dst_after = dst[i_after] == is_dst
+        extreme = np.maximum if is_dst else np.minimum
+        choice = np.where(
+            dst_before == dst_after,
+            extreme(offsets[i_before], offsets[i_after]),
+            np.where(dst_before, offsets[i_before], offsets[i_after])
+        )
+        utc_offsets = np.where(ambiguous, choice, utc_offsets)
+    non_existent = ~(valid_before | valid_after)
+    if np.any(non_existent):
+        shift = np.timedelta64(6, 'h') if is_dst else -np.timedelta64(6, 'h')
+        utc_offsets[non_existent] = _get_utc_offsets(timestamps[non_existent] + shift, timezone_str, is_dst)
+    return utc_offsets
@@ -4,8 +4,13 @@ from .geometry import SunPositionCalculator
 from .geometry import SunPath
 from .geometry import plot_sun_path_diagram
 
+from .ephemeris import Ephemeris
+from .shading import ShadingMask
+
 from .energy import Surface
 from .energy import SunEnergyCalculator
 
 from .horizon import HorizonPoint
 from .horizon import HorizonProfile
+
+from .terrain import ElevationRaster
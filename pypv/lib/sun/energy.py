@@ -1,7 +1,12 @@
+from typing import Dict, List, Optional
+import datetime
 import math
 
-from sun.geometry import SunPosition
+import numpy as np
+
+from sun.geometry import SunPosition, SunPositionCalculator, Location
 from sun.horizon import HorizonProfile
+from sun.shading import ShadingMask
 from quantities.geometry import Angle
 
 
@@ -16,12 +21,70 @@ class Surface:
 
 
 class SunEnergyCalculator:
-    def __init__(self, sun_position: SunPosition, surface: Surface, day_number: int):
+    # optional shading masks of horizon profiles (see enable_shading_masks(...))
+    _shading_masks_enabled = False
+    _shading_mask_dir: Optional[str] = None
+    _shading_mask_step = 3600
+    _shading_masks: Dict[str, ShadingMask] = {}
+
+    def __init__(
+            self,
+            sun_position: SunPosition,
+            surface: Surface,
+            day_number: int,
+            location: Location = None,
+            py_datetime: datetime.datetime = None
+    ):
         self.day_number = day_number
         self.surface = surface
         self.sun_pos = sun_position
+        # location and local date-time of the sun position are only needed to look up shading masks
+        self.location = location
+        self.py_datetime = py_datetime
         self.incidence_angle = self._incidence_angle()
 
+    @classmethod
+    def enable_shading_masks(cls, directory: str = None, step: int = 3600):
+        """
+        Take the shadowing of the beam irradiance by horizon profiles from shading masks with a time step of 'step'
+        seconds. For each horizon profile, location and year the mask is calculated only once and shared by all
+        surfaces with the same horizon profile. If 'directory' is given, the masks are also saved in it, so that later
+        runs can load them again.
+        """
+        cls._shading_masks_enabled = True
+        cls._shading_mask_dir = directory
+        cls._shading_mask_step = step
+        cls._shading_masks = {}
+
+    @classmethod
+    def disable_shading_masks(cls):
+        cls._shading_masks_enabled = False
+        cls._shading_mask_dir = None
+        cls._shading_masks = {}
+
+    @classmethod
+    def get_shading_mask(cls, hz_profile: HorizonProfile, location: Location, year: int) -> Optional[ShadingMask]:
+        """
+        Get the shading mask of the horizon profile and location for the given year, or None if shading masks are
+        disabled.
+        """
+        if not cls._shading_masks_enabled:
+            return None
+        step = cls._shading_mask_step
+        # the mask holds the sun positions of the precision tier in use
+        precision = SunPositionCalculator.get_precision()
+        key = ShadingMask.get_key(hz_profile, location, year, step, precision)
+        mask = cls._shading_masks.get(key)
+        if mask is None:
+            if cls._shading_mask_dir is not None:
+                mask = ShadingMask.load(cls._shading_mask_dir, key, year, step)
+            if mask is None:
+                mask = ShadingMask.calculate(hz_profile, location, year, step, precision)
+                if cls._shading_mask_dir is not None:
+                    mask.save(cls._shading_mask_dir, key)
+            cls._shading_masks[key] = mask
+        return mask
+
     def _incidence_angle(self):
         azi_sun = self.sun_pos.azimuth('rad')
         zenith_sun = math.pi / 2.0 - self.sun_pos.elevation('rad')
@@ -80,12 +143,47 @@ class SunEnergyCalculator:
             f_sky = self._anisotropic_sky_radiation_correction()
         else:
             f_sky = (1 + math.cos(tilt_surf)) / 2.0
+        # the horizon profile also blocks part of the diffuse sky irradiance
+        f_sky *= self.sky_view_factor(self.surface)
         f_grnd = (1 - math.cos(tilt_surf)) / 2.0
         irr_dir = irr_beam * math.cos(ia)
         irr_dif = f_sky * irr_dif + f_grnd * rho_grnd * irr_gl_hor
         return irr_dir + irr_dif
 
+    @staticmethod
+    def sky_view_factor(surface: Surface) -> float:
+        """
+        Get the part of the diffuse sky irradiance on the surface that is not blocked by the horizon profile of the
+        surface (1.0 for a surface without horizon profile). The factor is integrated once over the sky vault (with
+        isotropic sky radiance) for each surface orientation under a horizon profile, and then cached with the profile
+        (until its points are set again).
+        """
+        hz_profile = surface.hz_profile
+        if not hz_profile:
+            return 1.0
+        key = (surface.azimuth('deg'), surface.tilt('deg'))
+        svf = hz_profile.sky_view_factors.get(key)
+        if svf is None:
+            # midpoints of a grid over the sky vault: 1° in azimuth and 0.5° in elevation
+            azimuth = np.arange(0.5, 360.0, 1.0)
+            elevation = np.arange(0.25, 90.0, 0.5)
+            azi, elev = np.radians(azimuth)[:, np.newaxis], np.radians(elevation)[np.newaxis, :]
+            azi_surf, tilt_surf = surface.azimuth('rad'), surface.tilt('rad')
+            # radiance from each direction of the sky weighted with the incidence angle on the surface and with the
+            # solid angle of the grid cell
+            cos_i = np.cos(elev) * np.sin(tilt_surf) * np.cos(azi - azi_surf) + np.sin(elev) * np.cos(tilt_surf)
+            weight = np.maximum(cos_i, 0.0) * np.cos(elev)
+            visible = elevation[np.newaxis, :] > hz_profile.elevation(azimuth)[:, np.newaxis]
+            svf = float(np.sum(weight[visible]) / np.sum(weight)) if np.sum(weight) > 0.0 else 1.0
+            hz_profile.sky_view_factors[key] = svf
+        return svf
+
     def _check_shadowing(self):
+        if self.surface.hz_profile and self.location is not None and self.py_datetime is not None:
+            mask = self.get_shading_mask(self.surface.hz_profile, self.location, self.py_datetime.year)
+            shadowed = mask.is_shadowed(self.py_datetime) if mask is not None else None
+            if shadowed is not None:
+                return shadowed
         if self.surface.hz_profile:
             azi_sun = self.sun_pos.azimuth('deg')
             elev_sun = self.sun_pos.elevation('deg')
@@ -101,3 +199,105 @@ class SunEnergyCalculator:
         else:
             irr_beam = self._irradiance_beam(irr_gl_hor, irr_dif)
         return self._irradiance_surf(irr_beam, irr_dif, irr_gl_hor, rho_grnd, model)
+
+    @classmethod
+    def calculate_irradiances(
+            cls,
+            sun_positions: Dict[str, np.ndarray],
+            surfaces: List[Surface],
+            day_numbers: np.ndarray,
+            irr_gl_hor: np.ndarray,
+            rho_grnd=0.2,
+            model='anisotropic',
+            location: Location = None,
+            timestamps: np.ndarray = None
+    ) -> np.ndarray:
+        """
+        Array version of calculate_irradiance(...): calculate the irradiance on each of the surfaces in 'surfaces' at
+        all the instants of a time series at once.
+        Params:
+            - sun_positions     dict with arrays of sun 'azimuth' and 'elevation' in degrees (e.g. returned by
+                                SunPositionCalculator.calculate_positions(...))
+            - day_numbers       array with the day number (day of the year) of each instant
+            - irr_gl_hor        array of global irradiance on the horizontal plane [W/m²]
+            - location          location of the surfaces (only needed to look up shading masks)
+            - timestamps        array of local date-times (NumPy datetime64) of the instants (only needed to look up
+                                shading masks)
+        Returns an array (number of surfaces x number of instants) of irradiance on the surfaces [W/m²].
+        """
+        azi_sun = np.radians(np.asarray(sun_positions['azimuth'], dtype=np.float64))[np.newaxis, :]
+        elev_sun_deg = np.asarray(sun_positions['elevation'], dtype=np.float64)
+        zenith_sun = (math.pi / 2.0 - np.radians(elev_sun_deg))[np.newaxis, :]
+        irr_gl_hor = np.asarray(irr_gl_hor, dtype=np.float64)[np.newaxis, :]
+        day_numbers = np.asarray(day_numbers, dtype=np.float64)
+        azi_surf = np.array([surface.azimuth('rad') for surface in surfaces])[:, np.newaxis]
+        tilt_surf = np.array([surface.tilt('rad') for surface in surfaces])[:, np.newaxis]
+
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            # incidence angle (90° if the sun is behind the surface)
+            cos_i = (np.sin(zenith_sun) * np.sin(tilt_surf) * np.cos(azi_sun - azi_surf)
+                     + np.cos(zenith_sun) * np.cos(tilt_surf))
+            valid = (cos_i >= 0.0) & (cos_i <= 1.0)
+            ia = np.where(valid, np.arccos(np.where(valid, cos_i, 0.0)), math.pi / 2.0)
+            cos_ia = np.cos(ia)
+
+            # diffuse irradiance on the horizontal plane (piecewise correlation of the diffuse fraction)
+            irr_et = (1 + 0.033 * np.cos(2 * math.pi * day_numbers / 365.25)) * 1367.0
+            am = 1 / np.cos(zenith_sun)
+            kT = irr_gl_hor / irr_et * am
+            r = np.where(
+                (kT >= 0.0) & (kT <= 0.22),
+                1.0 - 0.09 * kT,
+                np.where(
+                    (kT > 0.22) & (kT <= 0.8),
+                    0.9511 - 0.1604 * kT + 4.388 * kT ** 2 - 16.638 * kT ** 3 + 12.336 * kT ** 4,
+                    0.165
+                )
+            )
+            irr_dif = r * irr_gl_hor
+
+            # beam irradiance, which is blocked if the sun is below the horizon profile of the surface
+            irr_beam = (irr_gl_hor - irr_dif) / np.cos(zenith_sun)
+            shadowed = np.zeros((len(surfaces), elev_sun_deg.size), dtype=bool)
+            for i, surface in enumerate(surfaces):
+                if surface.hz_profile:
+                    shadowed[i] = cls._get_shadowed(surface.hz_profile, sun_positions, location, timestamps)
+            irr_beam = np.where(shadowed, 0.0, irr_beam)
+
+            # irradiance on the surfaces
+            if model == 'anisotropic':
+                Y = np.maximum(0.45, 0.55 + 0.437 * cos_ia + 0.313 * cos_ia ** 2)
+                f_sky = np.where(
+                    tilt_surf <= math.pi / 2.0,
+                    Y * np.sin(tilt_surf) + np.cos(tilt_surf),
+                    Y * np.sin(tilt_surf)
+                )
+            else:
+                f_sky = (1 + np.cos(tilt_surf)) / 2.0
+            f_sky = f_sky * np.array([cls.sky_view_factor(surface) for surface in surfaces])[:, np.newaxis]
+            f_grnd = (1 - np.cos(tilt_surf)) / 2.0
+            return irr_beam * cos_ia + f_sky * irr_dif + f_grnd * rho_grnd * irr_gl_hor
+
+    @classmethod
+    def _get_shadowed(
+            cls,
+            hz_profile: HorizonProfile,
+            sun_positions: Dict[str, np.ndarray],
+            location: Optional[Location],
+            timestamps: Optional[np.ndarray]
+    ) -> np.ndarray:
+        # True where the sun is below the horizon profile: taken from the shading masks where possible, else evaluated
+        elev_sun_deg = np.asarray(sun_positions['elevation'], dtype=np.float64)
+        shadowed = np.zeros(elev_sun_deg.shape, dtype=bool)
+        found = np.zeros(elev_sun_deg.shape, dtype=bool)
+        if cls._shading_masks_enabled and location is not None and timestamps is not None:
+            timestamps = np.asarray(timestamps, dtype='datetime64[s]')
+            years = timestamps.astype('datetime64[Y]')
+            for year in np.unique(years):
+                mask = cls.get_shading_mask(hz_profile, location, int(str(year)))
+                in_year = years == year
+                found[in_year], shadowed[in_year] = mask.get_shadowed(timestamps[in_year])
+        if not np.all(found):
+            azi_sun_deg = np.asarray(sun_positions['azimuth'], dtype=np.float64)
+            shadowed[~found] = elev_sun_deg[~found] < hz_profile.elevation(azi_sun_deg[~found])
+        return shadowed
@@ -0,0 +1,80 @@
+from typing import Optional, Tuple
+import datetime
+import hashlib
+import os
+
+import numpy as np
+
+from array_store import save_array, load_arrays
+
+
+class Ephemeris:
+    """
+    Table of sun positions (azimuth and elevation) at a fixed time step through a whole year, and of sunrise, sunset
+    and solar noon for each day of that year, for one location. Times are local (in the time zone of the location).
+    The table can be stored on disk as binary files, which are memory-mapped again when the table is loaded.
+    """
+    def __init__(self, year: int, step: int, positions: np.ndarray, daily: np.ndarray):
+        self.year = year
+        self.step = step            # time step of the sun positions [s]
+        self.positions = positions  # array (n_steps x 2) with azimuth and elevation [°]
+        self.daily = daily          # array (n_days x 3) with sunrise, sunset and solar noon [s since midnight]
+        self._start = datetime.datetime(year, 1, 1)
+
+    @staticmethod
+    def get_key(
+            latitude: float,
+            longitude: float,
+            altitude: float,
+            timezone: str,
+            year: int,
+            step: int,
+            precision: str = 'astral'
+    ) -> str:
+        """
+        Get the file name key of the ephemeris of a location for a given year and time step, calculated with the
+        precision tier 'precision' of the sun positions (see SunPositionCalculator.set_precision(...)).
+        """
+        key = repr((float(latitude), float(longitude), float(altitude), timezone, int(year), int(step), precision))
+        return 'ephemeris_' + hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+
+    @classmethod
+    def load(cls, directory: str, key: str, year: int, step: int) -> Optional['Ephemeris']:
+        """Load the ephemeris stored in 'directory' under 'key' (memory-mapped). Return None if it does not exist."""
+        arrays = load_arrays([os.path.join(directory, f'{key}_{name}.npy') for name in ('positions', 'daily')])
+        if arrays is None:
+            return None
+        return cls(year, step, *arrays)
+
+    def save(self, directory: str, key: str):
+        """Store the ephemeris in 'directory' under 'key'."""
+        for name, array in (('positions', self.positions), ('daily', self.daily)):
+            save_array(os.path.join(directory, f'{key}_{name}.npy'), array)
+
+    def get_position(self, py_datetime: datetime.datetime) -> Optional[Tuple[float, float]]:
+        """
+        Get azimuth and elevation [°] of the sun at local date-time 'py_datetime'. Return None if the date-time is
+        not on the time step of the table (or not in the year of the table).
+        """
+        index, remainder = divmod(int((py_datetime - self._start).total_seconds()), self.step)
+        if remainder != 0 or py_datetime.microsecond != 0 or not (0 <= index < len(self.positions)):
+            return None
+        azimuth, elevation = self.positions[index]
+        return float(azimuth), float(elevation)
+
+    def get_positions(self, timestamps: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Array version of get_position(...) for local date-times 'timestamps' (NumPy datetime64[s]). Returns a boolean
+        array that is True where the date-time is on the time step of the table, and arrays of azimuth and elevation
+        [°] (only valid where the boolean array is True).
+        """
+        seconds = (timestamps - np.datetime64(self._start, 's')).astype(np.int64)
+        index, remainder = np.divmod(seconds, self.step)
+        found = (remainder == 0) & (index >= 0) & (index < len(self.positions))
+        positions = np.asarray(self.positions)[np.where(found, index, 0)]
+        return found, positions[..., 0], positions[..., 1]
+
+    def get_daily(self, date: datetime.date) -> Tuple[float, float, float]:
+        """Get sunrise, sunset and solar noon on 'date' as seconds since midnight (NaN if the sun does not rise)."""
+        sunrise, sunset, solar_noon = self.daily[date.timetuple().tm_yday - 1]
+        return float(sunrise), float(sunset), float(solar_noon)
@@ -1,13 +1,15 @@
-from typing import List
+from typing import List, Dict, Optional
+import datetime
 
 import astral
 import numpy as np
 import pandas as pd
 
-from quantities.date_time import Time, Date, DateTime, TimeDelta
+from quantities.date_time import Time, Date, DateTime, TimeDelta, convert_to_lt_array, convert_to_utc_array
 from quantities.geometry import Angle
 from nummath import interpolation, graphing
 from sun.horizon import HorizonProfile
+from sun.ephemeris import Ephemeris
 
 
 class Location:
@@ -19,7 +21,10 @@ class Location:
         self.longitude = longitude
         self.timezone = timezone  # see Wikipedia: list of tz database time zones
         self.altitude = altitude
-        self.astral_location = astral.Location((
+        self.astral_location = self._create_astral_location()
+
+    def _create_astral_location(self):
+        return astral.Location((
             self.name,
             self.region,
             self.latitude,
@@ -28,6 +33,16 @@ class Location:
             self.altitude
         ))
 
+    def __getstate__(self):
+        # astral.Location cannot be pickled; it is recreated when unpickling (e.g. when sent to a process pool)
+        state = self.__dict__.copy()
+        del state['astral_location']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.astral_location = self._create_astral_location()
+
 
 class SunPosition:
     def __init__(self, azimuth, elevation):
@@ -46,45 +61,395 @@ class SunPosition:
 
 
 class SunPositionCalculator:
+    # precision tiers of the sun position (see set_precision(...))
+    PRECISIONS = ('astral', 'noaa', 'michalsky', 'spencer')
+    _precision = 'astral'
+    # optional ephemeris tables (see enable_ephemeris(...))
+    _ephemeris_dir: Optional[str] = None
+    _ephemeris_step = 3600
+    _ephemerides: Dict[str, Ephemeris] = {}
+    # tables of sunrise, sunset, solar noon and day length per location and year (see get_daily_events(...))
+    _daily_events: Dict[tuple, Dict[str, np.ndarray]] = {}
+
+    @classmethod
+    def set_precision(cls, precision: str):
+        """
+        Set the algorithm that calculates sun positions by default. The tiers and their maximum angular error (angle
+        between the calculated direction of the sun and the direction according to the tier 'noaa', measured with the
+        sun above the horizon, at a 5 minute time step through the years 2000 - 2050 and at latitudes up to 65°):
+            - 'astral'      NOAA algorithm as implemented by astral (default): 0.6°, because astral adds the time of
+                            the day twice to the Julian day
+            - 'noaa'        NOAA algorithm (full precision: about 0.01° from the true sun position according to NOAA)
+            - 'michalsky'   low precision formulas of the Astronomical Almanac (Michalsky, 1988): 0.02°
+            - 'spencer'     Fourier series of Spencer (1971) for declination and equation of time: 0.8°
+        The tiers 'michalsky' and 'spencer' need far fewer operations than the NOAA algorithm and are meant for large
+        sweeps. Sunrise, sunset and solar noon are always calculated as astral does. Ephemeris tables (see
+        enable_ephemeris(...)) are only used with the tier 'astral'.
+        """
+        if precision not in cls.PRECISIONS:
+            raise ValueError(f'{precision} is not recognized')
+        cls._precision = precision
+
+    @classmethod
+    def get_precision(cls) -> str:
+        """Get the algorithm that calculates sun positions by default (see set_precision(...))."""
+        return cls._precision
+
+    @classmethod
+    def enable_ephemeris(cls, directory: str, step: int = 3600):
+        """
+        Take sun positions, sunrise, sunset and solar noon from ephemeris tables with a time step of 'step' seconds,
+        stored in 'directory'. For each location and year the table is calculated only once and saved; later runs
+        (also in other processes) memory-map the saved table. Sun positions at times that are not on the time step of
+        the table are still calculated.
+        """
+        cls._ephemeris_dir = directory
+        cls._ephemeris_step = step
+        cls._ephemerides = {}
+
+    @classmethod
+    def disable_ephemeris(cls):
+        cls._ephemeris_dir = None
+        cls._ephemerides = {}
+
+    @classmethod
+    def get_ephemeris(cls, location: Location, year: int) -> Optional[Ephemeris]:
+        """Get the ephemeris table of the location for the given year, or None if ephemeris tables are disabled."""
+        if cls._ephemeris_dir is None:
+            return None
+        step = cls._ephemeris_step
+        # ephemeris tables are always calculated with the tier 'astral' (see _calculate_ephemeris(...))
+        key = Ephemeris.get_key(
+            location.latitude, location.longitude, location.altitude, location.timezone, year, step, 'astral'
+        )
+        ephemeris = cls._ephemerides.get(key)
+        if ephemeris is None:
+            ephemeris = Ephemeris.load(cls._ephemeris_dir, key, year, step)
+            if ephemeris is None:
+                ephemeris = cls._calculate_ephemeris(location, year, step)
+                ephemeris.save(cls._ephemeris_dir, key)
+            cls._ephemerides[key] = ephemeris
+        return ephemeris
+
+    @classmethod
+    def _calculate_ephemeris(cls, location: Location, year: int, step: int) -> Ephemeris:
+        timestamps = np.arange(
+            np.datetime64(f'{year}-01-01T00:00:00'),
+            np.datetime64(f'{year + 1}-01-01T00:00:00'),
+            np.timedelta64(step, 's')
+        )
+        positions = cls._calculate_positions(location, timestamps)
+        events = cls.get_daily_events(location, year)
+        daily = np.stack((events['sunrise'], events['sunset'], events['solar_noon']), axis=1)
+        return Ephemeris(year, step, np.stack((positions['azimuth'], positions['elevation']), axis=1), daily)
+
     @staticmethod
-    def calculate_position(location: Location, date: Date, time: Time):
-        loc = location.astral_location
+    def calculate_daily_events(location: Location, year: int) -> Dict[str, np.ndarray]:
+        """
+        Calculate sunrise, sunset and solar noon for all days of the given year at once, in the same way as astral
+        does. Returns a dict with arrays of the 'date' (NumPy datetime64), 'sunrise', 'sunset' and 'solar_noon' as
+        local time in seconds since midnight of that date (NaN on days when the sun does not rise or set), and the
+        'day_length' in seconds.
+        """
+        dates = np.arange(np.datetime64(f'{year}-01-01'), np.datetime64(f'{year + 1}-01-01'))
+        jd = (dates - np.datetime64('1900-01-01', 'D')).astype(np.float64) + 2.0 + 2415018.5
+        dec, eq_time = _declination_eq_of_time((jd - 2451545.0) / 36525.0)
+
+        # hour angle at which the sun is 0.833° below the horizon, corrected for the altitude of the location
+        lat = np.radians(min(max(location.latitude, -89.8), 89.8))
+        depression = 90.0 + 0.833
+        altitude = int(location.altitude)
+        if altitude > 0:
+            r = 6356900.0  # radius of the earth
+            theta = np.arccos(r / (r + altitude))
+            a2 = r * np.sin(theta)
+            depression += np.degrees(np.arccos(a2 / np.hypot(a2, r - r * np.cos(theta))))
+        h = np.cos(np.radians(depression)) / (np.cos(lat) * np.cos(dec)) - np.tan(lat) * np.tan(dec)
+        with np.errstate(invalid='ignore'):
+            hour_angle = np.degrees(np.arccos(np.where(np.abs(h) <= 1.0, h, np.nan)))
+
+        # times in UTC [h] and conversion to local time in seconds since midnight
+        times_utc = {
+            'sunrise': (720.0 + 4.0 * (-location.longitude - hour_angle) - eq_time) / 60.0,
+            'sunset': (720.0 + 4.0 * (-location.longitude + hour_angle) - eq_time) / 60.0,
+            'solar_noon': (720.0 - 4.0 * location.longitude - eq_time) / 60.0
+        }
+        midnight = dates.astype('datetime64[s]')
+        events = {'date': dates}
+        for name, time_utc in times_utc.items():
+            seconds = _truncate_utc_time(time_utc)
+            valid = ~np.isnan(seconds)
+            local = convert_to_lt_array(
+                midnight[valid] + seconds[valid].astype(np.int64).astype('timedelta64[s]'),
+                location.timezone
+            )
+            events[name] = np.full(len(dates), np.nan)
+            events[name][valid] = (local - midnight[valid]).astype(np.float64)
+        events['day_length'] = events['sunset'] - events['sunrise']
+        return events
+
+    @classmethod
+    def get_daily_events(cls, location: Location, year: int) -> Dict[str, np.ndarray]:
+        """
+        Get the table of sunrise, sunset, solar noon and day length of the location for the given year (see
+        calculate_daily_events(...)). The table is calculated only once per location and year.
+        """
+        key = (location.latitude, location.longitude, location.altitude, location.timezone, year)
+        events = cls._daily_events.get(key)
+        if events is None:
+            events = cls.calculate_daily_events(location, year)
+            cls._daily_events[key] = events
+        return events
+
+    @classmethod
+    def _get_daily(cls, location: Location, date: Date, i: int) -> datetime.datetime:
+        # sunrise (i = 0), sunset (i = 1) or solar noon (i = 2) as local date-time, from the ephemeris table if enabled,
+        # otherwise from the table of daily events
+        ephemeris = cls.get_ephemeris(location, date.year)
+        if ephemeris is not None:
+            seconds = ephemeris.get_daily(date.py_date)[i]
+        else:
+            events = cls.get_daily_events(location, date.year)
+            seconds = events[('sunrise', 'sunset', 'solar_noon')[i]][date.py_date.timetuple().tm_yday - 1]
+        if np.isnan(seconds):
+            raise astral.AstralError('Sun never reaches the horizon on this day, at this location.')
+        midnight = datetime.datetime.combine(date.py_date, datetime.time(0, 0, 0))
+        return midnight + datetime.timedelta(seconds=float(seconds))
+
+    @classmethod
+    def calculate_position(cls, location: Location, date: Date, time: Time, precision: str = None):
         py_datetime = DateTime(date=date, time=time).py_datetime
+        precision = precision or cls._precision
+        if precision != 'astral':
+            positions = cls.calculate_positions(location, np.array([py_datetime], dtype='datetime64[s]'), precision)
+            return SunPosition(azimuth=float(positions['azimuth'][0]), elevation=float(positions['elevation'][0]))
+        ephemeris = cls.get_ephemeris(location, date.year)
+        position = ephemeris.get_position(py_datetime) if ephemeris is not None else None
+        if position is not None:
+            return SunPosition(azimuth=position[0], elevation=position[1])
+        loc = location.astral_location
         return SunPosition(
             azimuth=loc.solar_azimuth(py_datetime),
             elevation=loc.solar_elevation(py_datetime)
         )
 
+    @classmethod
+    def calculate_positions(
+            cls,
+            location: Location,
+            timestamps: np.ndarray,
+            precision: str = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Calculate the sun position at all the local date-times in array 'timestamps' (NumPy datetime64, naive, in the
+        time zone of the location) at once.
+        Returns a dict with arrays of 'azimuth', 'elevation' and 'zenith' angles in degrees.
+        The NOAA algorithm is implemented in NumPy in the same way as astral does in calculate_position(...), including
+        the refraction correction of the elevation, so that both give the same sun positions. If ephemeris tables are
+        enabled, sun positions at date-times on the time step of the table are taken from the table.
+        With 'precision' another tier than the default one can be chosen (see set_precision(...)).
+        """
+        timestamps = np.asarray(timestamps, dtype='datetime64[s]')
+        precision = precision or cls._precision
+        if precision == 'noaa':
+            return cls._calculate_positions(location, timestamps, astral_julian_day=False)
+        if precision == 'michalsky':
+            return cls._calculate_positions_michalsky(location, timestamps)
+        if precision == 'spencer':
+            return cls._calculate_positions_spencer(location, timestamps)
+        if precision != 'astral':
+            raise ValueError(f'{precision} is not recognized')
+        if cls._ephemeris_dir is None:
+            return cls._calculate_positions(location, timestamps)
+        azimuth = np.empty(timestamps.shape)
+        elevation = np.empty(timestamps.shape)
+        found = np.zeros(timestamps.shape, dtype=bool)
+        years = timestamps.astype('datetime64[Y]')
+        for year in np.unique(years):
+            ephemeris = cls.get_ephemeris(location, int(str(year)))
+            in_year = years == year
+            found[in_year], azimuth[in_year], elevation[in_year] = ephemeris.get_positions(timestamps[in_year])
+        if not np.all(found):
+            positions = cls._calculate_positions(location, timestamps[~found])
+            azimuth[~found] = positions['azimuth']
+            elevation[~found] = positions['elevation']
+        return {'azimuth': azimuth, 'elevation': elevation, 'zenith': 90.0 - elevation}
+
     @staticmethod
-    def sunrise(location: Location, date: Date) -> Time:
-        loc = location.astral_location
-        sunrise = loc.sunrise(date.py_date)
-        return Time(sunrise.hour, sunrise.minute, sunrise.second)
+    def _calculate_positions(
+            location: Location,
+            timestamps: np.ndarray,
+            astral_julian_day: bool = True
+    ) -> Dict[str, np.ndarray]:
+        # local date-times to UTC like astral does (pytz localize with is_dst=False)
+        ts_utc = convert_to_utc_array(timestamps, location.timezone, is_dst=False)
+        days = ts_utc.astype('datetime64[D]')
+        day_fraction = (ts_utc - days).astype(np.float64) / 86400.0
+        jd = (days - np.datetime64('1900-01-01', 'D')).astype(np.float64) + 2.0 + 2415018.5 + day_fraction
+        if astral_julian_day:
+            # Julian day as astral calculates it: like astral, the time of the day is added twice
+            jc = (jd + day_fraction - 2451545.0) / 36525.0
+        else:
+            jc = (jd - 2451545.0) / 36525.0
+
+        dec, eq_time = _declination_eq_of_time(jc)
+
+        # hour angle and zenith angle
+        true_solar_time = day_fraction * 1440.0 + eq_time + 4.0 * location.longitude
+        true_solar_time = np.where(
+            true_solar_time > 1440.0,
+            true_solar_time - 1440.0 * np.ceil(true_solar_time / 1440.0 - 1.0),
+            true_solar_time
+        )
+        hour_angle = true_solar_time / 4.0 - 180.0
+        hour_angle = np.where(hour_angle < -180.0, hour_angle + 360.0, hour_angle)
+        lat = np.radians(min(max(location.latitude, -89.8), 89.8))
+        csz = np.clip(
+            np.sin(lat) * np.sin(dec) + np.cos(lat) * np.cos(dec) * np.cos(np.radians(hour_angle)),
+            -1.0, 1.0
+        )
+        zenith = np.arccos(csz)
+
+        # azimuth angle, clockwise from North
+        az_denom = np.cos(lat) * np.sin(zenith)
+        valid = np.abs(az_denom) > 0.001
+        with np.errstate(divide='ignore', invalid='ignore'):
+            az_rad = np.clip((np.sin(lat) * np.cos(zenith) - np.sin(dec)) / az_denom, -1.0, 1.0)
+        azimuth = 180.0 - np.degrees(np.arccos(np.where(valid, az_rad, 0.0)))
+        azimuth = np.where(hour_angle > 0.0, -azimuth, azimuth)
+        azimuth = np.where(valid, azimuth, 180.0 if location.latitude > 0.0 else 0.0)
+        azimuth = np.where(azimuth < 0.0, azimuth + 360.0, azimuth)
+
+        # elevation angle with correction for atmospheric refraction
+        elevation = _refract(90.0 - np.degrees(zenith))
+        return {'azimuth': azimuth, 'elevation': elevation, 'zenith': 90.0 - elevation}
 
     @staticmethod
-    def sunset(location: Location, date: Date) -> Time:
-        loc = location.astral_location
-        sunset = loc.sunset(date.py_date)
-        return Time(sunset.hour, sunset.minute, sunset.second)
+    def _calculate_positions_michalsky(location: Location, timestamps: np.ndarray) -> Dict[str, np.ndarray]:
+        # low precision formulas of the Astronomical Almanac for the sun position (Michalsky, 1988)
+        ts_utc = convert_to_utc_array(timestamps, location.timezone, is_dst=False)
+        n = (ts_utc - np.datetime64('2000-01-01T12:00:00', 's')).astype(np.float64) / 86400.0
+        mean_long = np.mod(280.460 + 0.9856474 * n, 360.0)
+        mean_anom = np.radians(np.mod(357.528 + 0.9856003 * n, 360.0))
+        ecl_long = np.radians(mean_long + 1.915 * np.sin(mean_anom) + 0.020 * np.sin(2.0 * mean_anom))
+        obliq = np.radians(23.439 - 0.0000004 * n)
+        ra = np.arctan2(np.cos(obliq) * np.sin(ecl_long), np.cos(ecl_long))
+        dec = np.arcsin(np.sin(obliq) * np.sin(ecl_long))
+        hours = (ts_utc - ts_utc.astype('datetime64[D]')).astype(np.float64) / 3600.0
+        gmst = np.mod(6.697375 + 0.0657098242 * n + hours, 24.0)
+        hour_angle = np.radians(15.0 * gmst + location.longitude) - ra
+        return _horizontal_coordinates(location.latitude, dec, hour_angle)
 
     @staticmethod
-    def solar_noon(location: Location, date: Date) -> Time:
-        loc = location.astral_location
-        solar_noon = loc.solar_noon(date.py_date)
+    def _calculate_positions_spencer(location: Location, timestamps: np.ndarray) -> Dict[str, np.ndarray]:
+        # low precision sun position with the Fourier series of Spencer (1971) for the declination and the equation
+        # of time
+        ts_utc = convert_to_utc_array(timestamps, location.timezone, is_dst=False)
+        days = ts_utc.astype('datetime64[D]')
+        day_numbers = (days - ts_utc.astype('datetime64[Y]')).astype(np.float64)
+        minutes = (ts_utc - days).astype(np.float64) / 60.0
+        n_days = np.where(_is_leap_year(ts_utc), 366.0, 365.0)
+        g = 2.0 * np.pi / n_days * (day_numbers + (minutes / 60.0 - 12.0) / 24.0)
+        dec = (0.006918 - 0.399912 * np.cos(g) + 0.070257 * np.sin(g) - 0.006758 * np.cos(2.0 * g)
+               + 0.000907 * np.sin(2.0 * g) - 0.002697 * np.cos(3.0 * g) + 0.00148 * np.sin(3.0 * g))
+        eq_time = 229.18 * (0.000075 + 0.001868 * np.cos(g) - 0.032077 * np.sin(g) - 0.014615 * np.cos(2.0 * g)
+                            - 0.040849 * np.sin(2.0 * g))
+        hour_angle = np.radians((minutes + eq_time + 4.0 * location.longitude) / 4.0 - 180.0)
+        return _horizontal_coordinates(location.latitude, dec, hour_angle)
+
+    @classmethod
+    def sunrise(cls, location: Location, date: Date) -> Time:
+        sunrise = cls._get_daily(location, date, 0)
+        return Time(sunrise.hour, sunrise.minute, sunrise.second)
+
+    @classmethod
+    def sunset(cls, location: Location, date: Date) -> Time:
+        sunset = cls._get_daily(location, date, 1)
+        return Time(sunset.hour, sunset.minute, sunset.second)
+
+    @classmethod
+    def solar_noon(cls, location: Location, date: Date) -> Time:
+        solar_noon = cls._get_daily(location, date, 2)
         return Time(solar_noon.hour, solar_noon.minute, solar_noon.second)
 
-    @staticmethod
-    def daylight_time(location: Location, date: Date) -> TimeDelta:
-        loc = location.astral_location
-        start_time, end_time = loc.daylight(date.py_date)
+    @classmethod
+    def daylight_time(cls, location: Location, date: Date) -> TimeDelta:
+        start_time = cls._get_daily(location, date, 0)
+        end_time = cls._get_daily(location, date, 1)
         return TimeDelta(DateTime.from_py_datetime(start_time), DateTime.from_py_datetime(end_time))
 
 
+def _declination_eq_of_time(jc: np.ndarray):
+    # NOAA solar declination [rad] and equation of time [min] at Julian century 'jc', in the same way as astral
+    l0 = (280.46646 + jc * (36000.76983 + 0.0003032 * jc)) % 360.0
+    m = 357.52911 + jc * (35999.05029 - 0.0001537 * jc)
+    e = 0.016708634 - jc * (0.000042037 + 0.0000001267 * jc)
+    m_rad = np.radians(m)
+    c = (np.sin(m_rad) * (1.914602 - jc * (0.004817 + 0.000014 * jc))
+         + np.sin(2.0 * m_rad) * (0.019993 - 0.000101 * jc)
+         + np.sin(3.0 * m_rad) * 0.000289)
+    omega = np.radians(125.04 - 1934.136 * jc)
+    app_long = np.radians(l0 + c - 0.00569 - 0.00478 * np.sin(omega))
+    mean_obliq = 23.0 + (26.0 + (21.448 - jc * (46.815 + jc * (0.00059 - jc * 0.001813))) / 60.0) / 60.0
+    obliq = np.radians(mean_obliq + 0.00256 * np.cos(omega))
+    dec = np.arcsin(np.sin(obliq) * np.sin(app_long))
+    y = np.tan(obliq / 2.0) ** 2
+    l0_rad = np.radians(l0)
+    eq_time = 4.0 * np.degrees(
+        y * np.sin(2.0 * l0_rad)
+        - 2.0 * e * np.sin(m_rad)
+        + 4.0 * e * y * np.sin(m_rad) * np.cos(2.0 * l0_rad)
+        - 0.5 * y * y * np.sin(4.0 * l0_rad)
+        - 1.25 * e * e * np.sin(2.0 * m_rad)
+    )
+    return dec, eq_time
+
+
+def _refract(exo_elevation: np.ndarray) -> np.ndarray:
+    # elevation [°] corrected for atmospheric refraction, in the same way as astral
+    refraction = np.zeros(exo_elevation.shape)
+    te = np.tan(np.radians(exo_elevation))
+    i = (exo_elevation > 5.0) & (exo_elevation <= 85.0)
+    refraction[i] = 58.1 / te[i] - 0.07 / te[i] ** 3 + 0.000086 / te[i] ** 5
+    i = (exo_elevation > -0.575) & (exo_elevation <= 5.0)
+    x = exo_elevation[i]
+    refraction[i] = 1735.0 + x * (-518.2 + x * (103.4 + x * (-12.79 + x * 0.711)))
+    i = exo_elevation <= -0.575
+    refraction[i] = -20.774 / te[i]
+    return exo_elevation + refraction / 3600.0
+
+
+def _horizontal_coordinates(latitude: float, dec: np.ndarray, hour_angle: np.ndarray) -> Dict[str, np.ndarray]:
+    # azimuth (clockwise from North) and elevation (corrected for atmospheric refraction) [°] of the sun from its
+    # declination and hour angle [rad]
+    lat = np.radians(min(max(latitude, -89.8), 89.8))
+    csz = np.clip(np.sin(lat) * np.sin(dec) + np.cos(lat) * np.cos(dec) * np.cos(hour_angle), -1.0, 1.0)
+    azimuth = np.arctan2(np.sin(hour_angle), np.cos(hour_angle) * np.sin(lat) - np.tan(dec) * np.cos(lat))
+    azimuth = np.mod(180.0 + np.degrees(azimuth), 360.0)
+    elevation = _refract(90.0 - np.degrees(np.arccos(csz)))
+    return {'azimuth': azimuth, 'elevation': elevation, 'zenith': 90.0 - elevation}
+
+
+def _is_leap_year(timestamps: np.ndarray) -> np.ndarray:
+    year = timestamps.astype('datetime64[Y]').astype(np.int64) + 1970
+    return (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+
+
+def _truncate_utc_time(time_utc: np.ndarray) -> np.ndarray:
+    # like astral, drop the fractions of a second from a time [h] by truncating hours, minutes and seconds in turn;
+    # returns the time in whole seconds
+    hour = np.trunc(time_utc)
+    minute = np.trunc((time_utc - hour) * 60.0)
+    second = np.trunc(((time_utc - hour) * 60.0 - minute) * 60.0)
+    return hour * 3600.0 + minute * 60.0 + second
+
+
 class SunPath:
-    def __init__(self, location: Location, date: Date):
+    def __init__(self, location: Location, date: Date, precision: str = None):
+        # precision: precision tier of the sun positions (see SunPositionCalculator.set_precision(...))
         self.label = date.py_date.strftime('%b %d')  # date format string example: 'Jun 21'
         self.t_ax = [Time(h, 0, 0) for h in range(24)]
-        sun_positions = [SunPositionCalculator.calculate_position(location, date, t) for t in self.t_ax]
+        sun_positions = [SunPositionCalculator.calculate_position(location, date, t, precision) for t in self.t_ax]
         self.azi_ax = [sp.azimuth('deg') for sp in sun_positions]
         self.elev_ax = [sp.elevation('deg') for sp in sun_positions]
         self.spi = interpolation.CubicSplineInterPol(x_data=self.azi_ax, y_data=self.elev_ax)
@@ -1,8 +1,9 @@
 import math
-from typing import List
+from typing import List, Dict, Tuple
+
+import numpy as np
 
 from quantities.geometry import Angle
-from nummath import interpolation
 
 
 class HorizonPoint:
@@ -52,41 +53,132 @@ class HorizonPoint:
         return Angle(azi, 'rad'), Angle(elev, 'rad'), pd
 
 
-class _Segment:
-    def __init__(self, start_point, end_point):
-        self.start_point = start_point
-        self.end_point = end_point
-        self.line = None
-
-
 class HorizonProfile:
     def __init__(self, id_: str, points: List[HorizonPoint]):
         self.id = id_
-        self._points = points
-        self._points.sort(key=lambda pnt: pnt.azimuth('deg'))
-        self._create_segments()
-
-    def _create_segments(self):
-        self._segments = []
-        for i in range(len(self._points[:-1])):
-            s = _Segment(start_point=self._points[i], end_point=self._points[i + 1])
-            s.line = interpolation.PolyInterPol(
-                x_data=[self._points[i].azimuth('deg'), self._points[i+1].azimuth('deg')],
-                y_data=[self._points[i].elevation('deg'), self._points[i+1].elevation('deg')]
-            )
-            self._segments.append(s)
-
-    def elevation(self, azimuth: float):
-        for s in self._segments:
-            if s.start_point.azimuth('deg') <= azimuth <= s.end_point.azimuth('deg'):
-                return s.line.solve(azimuth)
-        else:
-            return 0.0
+        self.points = points
+
+    @property
+    def points(self) -> List[HorizonPoint]:
+        """
+        Get the points of the profile sorted by azimuth. The profile keeps the values of its points from the moment
+        they were set, so changing a returned point (e.g. with HorizonPoint.move_viewpoint(...)) does not change the
+        profile: set the points again to change it.
+        """
+        return [
+            HorizonPoint(label, azi, elev, dist)
+            for label, azi, elev, dist in zip(self._labels, self._azi_ax, self._elev_ax, self._dist_ax)
+        ]
+
+    @points.setter
+    def points(self, points: List[HorizonPoint]):
+        # azimuth, elevation and planar distance of the points as arrays, so that the profile can be interpolated
+        # with np.interp
+        points = sorted(points, key=lambda pnt: pnt.azimuth('deg'))
+        self._labels = [pnt.label for pnt in points]
+        self._azi_ax = np.array([pnt.azimuth('deg') for pnt in points], dtype=np.float64)
+        self._elev_ax = np.array([pnt.elevation('deg') for pnt in points], dtype=np.float64)
+        self._dist_ax = np.array([pnt.planar_distance for pnt in points], dtype=np.float64)
+        self._create_arc()
+        # sky view factors under the profile per surface orientation (see SunEnergyCalculator.sky_view_factor(...));
+        # they are calculated again when the points are set
+        self.sky_view_factors: Dict[Tuple[float, float], float] = {}
+
+    def elevation(self, azimuth):
+        """
+        Get the elevation [°] of the horizon profile at 'azimuth' [°] (float or NumPy array). Azimuths are wrapped
+        around to the range 0°...360°. Between the points of the profile the elevation is interpolated linearly, also
+        across north (e.g. between points at 350° and 10°); outside the profile the elevation is zero.
+        """
+        azimuth = np.mod(np.asarray(azimuth, dtype=np.float64) - self._arc_azi_ax[0], 360.0) + self._arc_azi_ax[0]
+        elevation = np.where(
+            azimuth <= self._arc_azi_ax[-1],
+            np.interp(azimuth, self._arc_azi_ax, self._arc_elev_ax),
+            0.0
+        )
+        if elevation.ndim == 0:
+            return float(elevation)
+        return elevation
+
+    def _create_arc(self):
+        # The points of the profile form an arc of the horizon; the part of the horizon outside the profile is the
+        # widest gap between two successive points (north included), unless the profile already covers the full
+        # circle. The azimuths of the arc are unwrapped so that they increase from the start to the end of the arc.
+        azi_ax, elev_ax = self._azi_ax, self._elev_ax
+        if len(azi_ax) > 1 and azi_ax[-1] - azi_ax[0] < 360.0:
+            gaps = np.diff(azi_ax)
+            i = int(np.argmax(gaps))
+            if gaps[i] > azi_ax[0] + 360.0 - azi_ax[-1]:
+                # the profile crosses north: start the arc at the point after the widest gap
+                azi_ax = np.concatenate((azi_ax[i + 1:], azi_ax[:i + 1] + 360.0))
+                elev_ax = np.concatenate((elev_ax[i + 1:], elev_ax[:i + 1]))
+        self._arc_azi_ax, self._arc_elev_ax = azi_ax, elev_ax
+
+    def move_viewpoints(
+            self,
+            vp_south_coords: np.ndarray,
+            vp_east_coords: np.ndarray,
+            vp_heights: np.ndarray
+    ) -> Dict[str, np.ndarray]:
+        """
+        Array version of HorizonPoint.move_viewpoint(...): move the viewpoint of all the points of the profile to each
+        of the viewpoints at once. The viewpoints are given by arrays of their south coordinate, east coordinate and
+        height relative to the original viewpoint. The profile itself is not changed.
+        Returns a dict with 2D-arrays (number of viewpoints x number of points) of 'azimuth' [°], 'elevation' [°] and
+        'planar_distance' of the points as seen from each viewpoint, and the corresponding array of the point 'label'.
+        Like the points of a profile, each row is sorted by azimuth.
+        """
+        vp_south_coords = np.asarray(vp_south_coords, dtype=np.float64).reshape(-1, 1)
+        vp_east_coords = np.asarray(vp_east_coords, dtype=np.float64).reshape(-1, 1)
+        vp_heights = np.asarray(vp_heights, dtype=np.float64).reshape(-1, 1)
+        # rectangular coordinates of the obstacle points as seen from the original viewpoint
+        azi = np.pi - np.radians(self._azi_ax)
+        pd = self._dist_ax
+        south_coord = pd * np.cos(azi)
+        east_coord = pd * np.sin(azi)
+        height = pd * np.tan(np.radians(self._elev_ax))
+        # rectangular coordinates of the obstacle points as seen from the moved viewpoints
+        south_coord = south_coord[np.newaxis, :] - vp_south_coords
+        east_coord = east_coord[np.newaxis, :] - vp_east_coords
+        height = height[np.newaxis, :] - vp_heights
+        # polar coordinates of the obstacle points as seen from the moved viewpoints
+        pd = np.hypot(south_coord, east_coord)
+        elevation = np.degrees(np.arctan2(height, pd))
+        azimuth = np.degrees(np.mod(np.pi - np.arctan2(east_coord, south_coord), 2.0 * np.pi))
+        order = np.argsort(azimuth, axis=1, kind='stable')
+        labels = np.array(self._labels, dtype=object)
+        return {
+            'azimuth': np.take_along_axis(azimuth, order, axis=1),
+            'elevation': np.take_along_axis(elevation, order, axis=1),
+            'planar_distance': np.take_along_axis(pd, order, axis=1),
+            'label': labels[order]
+        }
+
+    @classmethod
+    def from_arrays(
+            cls,
+            id_: str,
+            azimuth: np.ndarray,
+            elevation: np.ndarray,
+            planar_distance: np.ndarray,
+            label: np.ndarray = None
+    ) -> 'HorizonProfile':
+        """
+        Create a horizon profile from arrays of azimuth [°], elevation [°], planar distance and label of its points
+        (e.g. one row of the arrays returned by move_viewpoints(...)).
+        """
+        if label is None:
+            label = [str(i + 1) for i in range(len(azimuth))]
+        points = [
+            HorizonPoint(str(lbl), float(azi), float(elev), float(dist))
+            for lbl, azi, elev, dist in zip(label, azimuth, elevation, planar_distance)
+        ]
+        return cls(id_, points)
 
     @property
     def azimuth_ax(self):
-        return [pnt.azimuth('deg') for pnt in self._points]
+        return self._azi_ax.tolist()
 
     @property
     def elevation_ax(self):
-        return [pnt.elevation('deg') for pnt in self._points]
+        return self._elev_ax.tolist()
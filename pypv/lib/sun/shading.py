@@ -0,0 +1,105 @@
+from typing import Optional, Tuple
+import datetime
+import hashlib
+import math
+import os
+
+import numpy as np
+
+from array_store import save_array, load_arrays
+from sun.geometry import Location, SunPositionCalculator
+from sun.horizon import HorizonProfile
+
+
+class ShadingMask:
+    """
+    Bitset that tells for a whole year at a fixed time step whether the sun is below the horizon profile (i.e. whether
+    the beam irradiance is blocked), for one horizon profile and location. Times are local (in the time zone of the
+    location). The mask can be stored on disk as a binary file, which is memory-mapped again when the mask is loaded.
+    """
+    def __init__(self, year: int, step: int, bits: np.ndarray, size: int):
+        self.year = year
+        self.step = step    # time step of the mask [s]
+        self.bits = bits    # mask packed with np.packbits (8 time steps per byte)
+        self.size = size    # number of time steps in the mask
+        self._start = datetime.datetime(year, 1, 1)
+
+    @staticmethod
+    def get_key(
+            hz_profile: HorizonProfile,
+            location: Location,
+            year: int,
+            step: int,
+            precision: str = None
+    ) -> str:
+        """
+        Get the file name key of the shading mask of a horizon profile and location for a given year and time step,
+        calculated with the precision tier 'precision' of the sun positions (by default the tier in use, see
+        SunPositionCalculator.set_precision(...)). The key depends on the points of the profile, so horizon profiles
+        with the same points share the same mask.
+        """
+        precision = precision or SunPositionCalculator.get_precision()
+        points = tuple(zip(hz_profile.azimuth_ax, hz_profile.elevation_ax))
+        key = repr((
+            hz_profile.id, points, float(location.latitude), float(location.longitude), float(location.altitude),
+            location.timezone, int(year), int(step), precision
+        ))
+        return 'shading_' + hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+
+    @classmethod
+    def calculate(
+            cls,
+            hz_profile: HorizonProfile,
+            location: Location,
+            year: int,
+            step: int,
+            precision: str = None
+    ) -> 'ShadingMask':
+        """
+        Calculate the shading mask of the horizon profile and location for the given year and time step, with sun
+        positions of the precision tier 'precision' (by default the tier in use).
+        """
+        timestamps = np.arange(
+            np.datetime64(f'{year}-01-01T00:00:00'),
+            np.datetime64(f'{year + 1}-01-01T00:00:00'),
+            np.timedelta64(step, 's')
+        )
+        positions = SunPositionCalculator.calculate_positions(location, timestamps, precision)
+        shadowed = positions['elevation'] < hz_profile.elevation(positions['azimuth'])
+        return cls(year, step, np.packbits(shadowed), shadowed.size)
+
+    @classmethod
+    def load(cls, directory: str, key: str, year: int, step: int) -> Optional['ShadingMask']:
+        """Load the shading mask stored in 'directory' under 'key' (memory-mapped). Return None if it does not exist."""
+        arrays = load_arrays([os.path.join(directory, f'{key}.npy')])
+        if arrays is None:
+            return None
+        seconds = (datetime.datetime(year + 1, 1, 1) - datetime.datetime(year, 1, 1)).total_seconds()
+        return cls(year, step, arrays[0], math.ceil(seconds / step))
+
+    def save(self, directory: str, key: str):
+        """Store the shading mask in 'directory' under 'key'."""
+        save_array(os.path.join(directory, f'{key}.npy'), self.bits)
+
+    def is_shadowed(self, py_datetime: datetime.datetime) -> Optional[bool]:
+        """
+        Get whether the sun is below the horizon profile at local date-time 'py_datetime'. Return None if the
+        date-time is not on the time step of the mask (or not in the year of the mask).
+        """
+        index, remainder = divmod(int((py_datetime - self._start).total_seconds()), self.step)
+        if remainder != 0 or py_datetime.microsecond != 0 or not (0 <= index < self.size):
+            return None
+        return bool((self.bits[index >> 3] >> (7 - (index & 7))) & 1)
+
+    def get_shadowed(self, timestamps: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Array version of is_shadowed(...) for local date-times 'timestamps' (NumPy datetime64[s]). Returns a boolean
+        array that is True where the date-time is on the time step of the mask, and a boolean array that is True where
+        the sun is below the horizon profile (only valid where the first array is True).
+        """
+        seconds = (timestamps - np.datetime64(self._start, 's')).astype(np.int64)
+        index, remainder = np.divmod(seconds, self.step)
+        found = (remainder == 0) & (index >= 0) & (index < self.size)
+        index = np.where(found, index, 0)
+        shadowed = (np.asarray(self.bits)[index >> 3] >> (7 - (index & 7))) & 1
+        return found, shadowed.astype(bool)
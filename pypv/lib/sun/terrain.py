@@ -0,0 +1,168 @@
+from typing import Dict, List, Optional, Tuple
+import math
+
+import numpy as np
+
+from sun.horizon import HorizonProfile
+
+
+class ElevationRaster:
+    """
+    Regular grid of terrain or surface elevations [m] (e.g. of a DEM or DSM of the site), from which the horizon
+    profiles of viewpoints on the site can be calculated. The rows of the grid run from north to south and the columns
+    from west to east, so that the row index increases with the south coordinate and the column index with the east
+    coordinate (the same coordinates as used by HorizonPoint.move_viewpoint(...)).
+    """
+    def __init__(self, elevations: np.ndarray, cell_size: float, origin: Tuple[float, float] = (0.0, 0.0)):
+        """
+        Params:
+            - elevations    2D-array of elevations [m]; can also be a memory-mapped array
+            - cell_size     size of the grid cells [m]
+            - origin        south and east coordinate [m] of the center of the first grid cell
+        """
+        self.elevations = elevations
+        self.cell_size = cell_size
+        self.origin = origin
+
+    @classmethod
+    def load(
+            cls,
+            file_path: str,
+            cell_size: float,
+            origin: Tuple[float, float] = (0.0, 0.0),
+            shape: Optional[Tuple[int, int]] = None,
+            dtype: str = 'float32'
+    ) -> 'ElevationRaster':
+        """
+        Memory-map the elevation grid from a local file, so that large rasters are not read into memory as a whole.
+        The file is either a NumPy .npy file, or a raw binary file of which the 'shape' (rows, columns) and 'dtype'
+        must be given.
+        """
+        if file_path.endswith('.npy'):
+            elevations = np.load(file_path, mmap_mode='r')
+        elif shape is not None:
+            elevations = np.memmap(file_path, dtype=dtype, mode='r', shape=shape)
+        else:
+            raise ValueError(f'shape of raw elevation raster {file_path} is not specified')
+        return cls(elevations, cell_size, origin)
+
+    def get_elevation(self, south_coords: np.ndarray, east_coords: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get the elevation [m] of the grid at arrays of south and east coordinates [m] (interpolated bilinearly between
+        the centers of the grid cells). Returns a boolean array that is True where the coordinates are inside the grid,
+        and the array of elevations (only valid where the boolean array is True).
+        """
+        n_rows, n_cols = self.elevations.shape
+        r = (np.asarray(south_coords, dtype=np.float64) - self.origin[0]) / self.cell_size
+        c = (np.asarray(east_coords, dtype=np.float64) - self.origin[1]) / self.cell_size
+        inside = (r >= 0.0) & (r <= n_rows - 1) & (c >= 0.0) & (c <= n_cols - 1)
+        r = np.where(inside, r, 0.0)
+        c = np.where(inside, c, 0.0)
+        r0 = np.minimum(r.astype(np.intp), max(n_rows - 2, 0))
+        c0 = np.minimum(c.astype(np.intp), max(n_cols - 2, 0))
+        r1 = np.minimum(r0 + 1, n_rows - 1)
+        c1 = np.minimum(c0 + 1, n_cols - 1)
+        fr = r - r0
+        fc = c - c0
+        z = self.elevations
+        elevation = (
+            (z[r0, c0] * (1.0 - fc) + z[r0, c1] * fc) * (1.0 - fr)
+            + (z[r1, c0] * (1.0 - fc) + z[r1, c1] * fc) * fr
+        )
+        return inside, elevation.astype(np.float64)
+
+    def calculate_horizons(
+            self,
+            vp_south_coords: np.ndarray,
+            vp_east_coords: np.ndarray,
+            vp_heights: np.ndarray,
+            n_azimuths: int = 72,
+            max_distance: float = None,
+            step: float = None,
+            chunk_size: int = 4_000_000
+    ) -> Dict[str, np.ndarray]:
+        """
+        Calculate the horizon of many viewpoints at once by marching along rays in 'n_azimuths' directions over the
+        elevation grid.
+        Params:
+            - vp_south_coords   array of south coordinates of the viewpoints [m]
+            - vp_east_coords    array of east coordinates of the viewpoints [m]
+            - vp_heights        array of heights of the viewpoints above the elevation grid [m]
+            - max_distance      length of the rays [m]; if None, the diagonal of the grid
+            - step              distance between the samples along the rays [m]; if None, the cell size of the grid
+            - chunk_size        maximum number of samples that are taken at once (limits memory usage)
+        Returns a dict with the array of 'azimuth' [°] of the rays and 2D-arrays (number of viewpoints x number of
+        azimuths) of the 'elevation' [°] of the horizon and the 'planar_distance' [m] to the obstacle that determines
+        it. Where no obstacle rises above the viewpoint, the elevation is zero and the planar distance is the length
+        of the rays.
+        """
+        vp_south_coords = np.asarray(vp_south_coords, dtype=np.float64).ravel()
+        vp_east_coords = np.asarray(vp_east_coords, dtype=np.float64).ravel()
+        vp_heights = np.broadcast_to(np.asarray(vp_heights, dtype=np.float64), vp_south_coords.shape)
+        n_rows, n_cols = self.elevations.shape
+        if max_distance is None:
+            max_distance = math.hypot(n_rows, n_cols) * self.cell_size
+        if step is None:
+            step = self.cell_size
+        distances = np.arange(1, math.ceil(max_distance / step) + 1) * step
+        azimuths = np.arange(n_azimuths) * (360.0 / n_azimuths)
+        # direction of the rays in south and east coordinates (see HorizonPoint._rectangular_coordinates(...))
+        azi = math.pi - np.radians(azimuths)
+        ray_south = np.cos(azi)[:, np.newaxis] * distances[np.newaxis, :]
+        ray_east = np.sin(azi)[:, np.newaxis] * distances[np.newaxis, :]
+
+        inside, z_vp = self.get_elevation(vp_south_coords, vp_east_coords)
+        if not np.all(inside):
+            raise ValueError('viewpoint is outside the elevation raster')
+        z_vp = z_vp + vp_heights
+
+        n_vp = vp_south_coords.size
+        elevation = np.zeros((n_vp, n_azimuths))
+        planar_distance = np.full((n_vp, n_azimuths), distances[-1])
+        n_chunk = max(1, chunk_size // ray_south.size)
+        for start in range(0, n_vp, n_chunk):
+            vps = slice(start, start + n_chunk)
+            # samples along the rays (viewpoints x azimuths x distances)
+            inside, z = self.get_elevation(
+                vp_south_coords[vps, np.newaxis, np.newaxis] + ray_south,
+                vp_east_coords[vps, np.newaxis, np.newaxis] + ray_east
+            )
+            # the horizon is where the slope from the viewpoint to the terrain is steepest
+            slope = np.where(inside, (z - z_vp[vps, np.newaxis, np.newaxis]) / distances, -np.inf)
+            i_max = np.argmax(slope, axis=2)
+            slope_max = np.take_along_axis(slope, i_max[..., np.newaxis], axis=2)[..., 0]
+            above = slope_max > 0.0
+            elevation[vps] = np.where(above, np.degrees(np.arctan(np.where(above, slope_max, 0.0))), 0.0)
+            planar_distance[vps] = np.where(above, distances[i_max], distances[-1])
+        return {'azimuth': azimuths, 'elevation': elevation, 'planar_distance': planar_distance}
+
+    def create_horizon_profiles(
+            self,
+            vp_south_coords: np.ndarray,
+            vp_east_coords: np.ndarray,
+            vp_heights: np.ndarray,
+            n_azimuths: int = 72,
+            max_distance: float = None,
+            step: float = None,
+            id_prefix: str = 'hp'
+    ) -> List[HorizonProfile]:
+        """
+        Same as calculate_horizons(...), but returns a HorizonProfile for each viewpoint. The profiles are closed at
+        360°, so that they cover all azimuths.
+        """
+        horizons = self.calculate_horizons(
+            vp_south_coords, vp_east_coords, vp_heights,
+            n_azimuths=n_azimuths, max_distance=max_distance, step=step
+        )
+        azimuth = np.append(horizons['azimuth'], 360.0)
+        label = [f'{azi:.1f}' for azi in azimuth]
+        return [
+            HorizonProfile.from_arrays(
+                f'{id_prefix}_{i + 1:02d}',
+                azimuth,
+                np.append(elevation, elevation[0]),
+                np.append(planar_distance, planar_distance[0]),
+                label
+            )
+            for i, (elevation, planar_distance) in enumerate(zip(horizons['elevation'], horizons['planar_distance']))
+        ]
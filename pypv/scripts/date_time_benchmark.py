@@ -0,0 +1,182 @@
+# Benchmark of the DateTime, Date and Time classes: memory used per object and throughput of creating objects and of
+# reading their fields, compared with the previous implementation of the classes (which stored the date and time
+# fields as attributes next to a Python datetime object) and with Python's datetime.datetime.
+
+import datetime
+import time as timer
+import tracemalloc
+
+import numpy as np
+
+from quantities.date_time import DateTime, Date, Time, ANY_YEAR
+
+N = 100_000
+
+
+class PreviousDateTime:
+    # the previous implementation of DateTime, reduced to the parts that are benchmarked
+    def __init__(self, year=ANY_YEAR, month=1, day=1, hour=0, minute=0, second=0):
+        self._year = year
+        self._month = month
+        self._day = day
+        self._hour = hour
+        self._minute = minute
+        self._second = second
+        self._py_datetime = datetime.datetime(year, month, day, hour, minute, second)
+
+    @property
+    def year(self):
+        return self._year
+
+    @property
+    def month(self):
+        return self._month
+
+    @property
+    def day(self):
+        return self._day
+
+    @property
+    def hour(self):
+        return self._hour
+
+    @property
+    def minute(self):
+        return self._minute
+
+    @property
+    def second(self):
+        return self._second
+
+    @property
+    def py_datetime(self):
+        return self._py_datetime
+
+    def __str__(self):
+        if self._year == ANY_YEAR:
+            return self._py_datetime.strftime('%d/%m %H:%M:%S')
+        return self._py_datetime.strftime('%d/%m/%Y %H:%M:%S')
+
+    @classmethod
+    def from_py_datetime(cls, py_datetime):
+        return cls(
+            py_datetime.year, py_datetime.month, py_datetime.day,
+            py_datetime.hour, py_datetime.minute, py_datetime.second
+        )
+
+
+class PreviousTime(PreviousDateTime):
+    # the previous implementation of Time, reduced to the parts that are benchmarked
+    def __init__(self, hour, minute, second):
+        super().__init__(hour=hour, minute=minute, second=second)
+        self._py_time = self._py_datetime.time()
+
+    @property
+    def as_decimal_hour(self):
+        return self._hour + self._minute / 60.0 + self._second / 3600.0
+
+    @classmethod
+    def from_py_datetime(cls, py_datetime):
+        return cls(py_datetime.hour, py_datetime.minute, py_datetime.second)
+
+
+# one year of date-times at a 15-minute time step (as in a weather data file)
+timestamps = np.arange(
+    np.datetime64(f'{ANY_YEAR}-01-01T00:00:00'),
+    np.datetime64(f'{ANY_YEAR}-01-01T00:00:00') + np.timedelta64(15 * N, 'm'),
+    np.timedelta64(15, 'm')
+).astype('datetime64[s]')
+py_datetimes = timestamps.tolist()
+epoch_seconds = timestamps.astype(np.int64).tolist()
+
+
+def measure_memory(create):
+    # memory [bytes] per object of the list returned by 'create'
+    tracemalloc.start()
+    objects = create()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return (size - 8 * len(objects)) / len(objects)
+
+
+def measure_time(func, repeat=3):
+    # best time [s] of 'repeat' calls of 'func'
+    t_min = float('inf')
+    for _ in range(repeat):
+        t_start = timer.perf_counter()
+        func()
+        t_min = min(t_min, timer.perf_counter() - t_start)
+    return t_min
+
+
+print(f'{N} objects')
+print('memory per object:')
+memory = {
+    'datetime.datetime': lambda: [
+        datetime.datetime(dt.year, dt.month, dt.day, dt.hour, dt.minute) for dt in py_datetimes
+    ],
+    'previous DateTime': lambda: [PreviousDateTime.from_py_datetime(dt) for dt in py_datetimes],
+    'DateTime': lambda: [DateTime.from_py_datetime(dt) for dt in py_datetimes],
+    'DateTime (after reading a field)': lambda: [
+        dt for dt in (DateTime.from_py_datetime(dt) for dt in py_datetimes) if dt.year
+    ],
+    'Date': lambda: [Date.from_py_datetime(dt) for dt in py_datetimes],
+    'previous Time': lambda: [PreviousTime.from_py_datetime(dt) for dt in py_datetimes],
+    'Time': lambda: [Time.from_py_datetime(dt) for dt in py_datetimes],
+}
+for name, create in memory.items():
+    print(f'    {name:<40}{measure_memory(create):8.1f} bytes')
+
+# throughput of the previous implementation and of the current one, side by side
+previous_date_times = [PreviousDateTime.from_py_datetime(dt) for dt in py_datetimes]
+previous_times = [PreviousTime.from_py_datetime(dt) for dt in py_datetimes]
+date_times = [DateTime.from_py_datetime(dt) for dt in py_datetimes]
+times = [Time.from_py_datetime(dt) for dt in py_datetimes]
+print(f"throughput:{'previous':>44}{'current':>12}")
+throughput = {
+    'DateTime(year=..., ..., second=...)': (
+        lambda: [
+            PreviousDateTime(year=dt.year, month=dt.month, day=dt.day, hour=dt.hour, minute=dt.minute)
+            for dt in py_datetimes
+        ],
+        lambda: [
+            DateTime(year=dt.year, month=dt.month, day=dt.day, hour=dt.hour, minute=dt.minute)
+            for dt in py_datetimes
+        ]
+    ),
+    'Time(hour, minute, second)': (
+        lambda: [PreviousTime(dt.hour, dt.minute, dt.second) for dt in py_datetimes],
+        lambda: [Time(dt.hour, dt.minute, dt.second) for dt in py_datetimes]
+    ),
+    'DateTime.from_py_datetime(...)': (
+        lambda: [PreviousDateTime.from_py_datetime(dt) for dt in py_datetimes],
+        lambda: [DateTime.from_py_datetime(dt) for dt in py_datetimes]
+    ),
+    'DateTime.year, .month, .day': (
+        lambda: [(dt.year, dt.month, dt.day) for dt in previous_date_times],
+        lambda: [(dt.year, dt.month, dt.day) for dt in date_times]
+    ),
+    'DateTime.hour, .minute, .second': (
+        lambda: [(dt.hour, dt.minute, dt.second) for dt in previous_date_times],
+        lambda: [(dt.hour, dt.minute, dt.second) for dt in date_times]
+    ),
+    'Time.as_decimal_hour': (
+        lambda: [t.as_decimal_hour for t in previous_times],
+        lambda: [t.as_decimal_hour for t in times]
+    ),
+    'DateTime.py_datetime': (
+        lambda: [dt.py_datetime for dt in previous_date_times],
+        lambda: [dt.py_datetime for dt in date_times]
+    ),
+    'str(DateTime)': (
+        lambda: [str(dt) for dt in previous_date_times],
+        lambda: [str(dt) for dt in date_times]
+    ),
+}
+for name, (previous_func, func) in throughput.items():
+    t_previous = measure_time(previous_func)
+    t = measure_time(func)
+    print(f'    {name:<40}{N / t_previous / 1e6:8.2f} M/s{N / t / 1e6:8.2f} M/s')
+# creating Time objects from epoch seconds is new (the previous implementation went through datetime objects)
+t = measure_time(lambda: [Time.from_epoch_seconds(s) for s in epoch_seconds])
+print(f"    {'Time.from_epoch_seconds(...)':<40}{'':>12}{N / t / 1e6:8.2f} M/s")
@@ -0,0 +1,28 @@
+# calculate horizon profiles from an elevation raster (DSM) of the site for a row of solar panel positions at once
+
+import numpy as np
+
+import sun
+
+
+# Elevation raster of the site: flat terrain with a building of 10 m high south of the solar panels (in practice the
+# raster is loaded from a local file with sun.ElevationRaster.load(...), which memory-maps it)
+cell_size = 0.5
+elevations = np.zeros((200, 200))
+elevations[120:140, 60:140] = 10.0
+raster = sun.ElevationRaster(elevations, cell_size)
+
+# Positions of the solar panels: a row of panels from west to east, 1.7 m above the terrain
+vp_east_coords = np.linspace(40.0, 60.0, 11)
+vp_south_coords = np.full(vp_east_coords.shape, 50.0)
+vp_heights = 1.7
+
+# Horizon profile for each position, with a ray every 5°
+profiles = raster.create_horizon_profiles(vp_south_coords, vp_east_coords, vp_heights, n_azimuths=72)
+
+for east_coord, profile in zip(vp_east_coords, profiles):
+    elevations = profile.elevation(np.array([135.0, 180.0, 225.0]))
+    print(
+        f'{profile.id} at {east_coord:.1f} m east: '
+        f'horizon elevation SE {elevations[0]:.1f}°, S {elevations[1]:.1f}°, SW {elevations[2]:.1f}°'
+    )
@@ -0,0 +1,56 @@
+# Cache of working conditions of PhotoVoltaicCharacteristics (see PhotoVoltaicCharacteristics.enable_cache(...)):
+# the inverter checks evaluate the PV matrices again and again at the same corner conditions (e.g. STC), which are
+# then taken from the cache.
+
+import sun
+import photovoltaic as pv
+
+loc = sun.Location(
+    name='Ghent',
+    region='Belgium',
+    latitude=51.07,
+    longitude=3.69,
+    altitude=9.0
+)
+
+pv_char = pv.PhotoVoltaicCharacteristics(
+    pv.STC(Isc=9.97, Voc=39.4, Impp=9.63, Vmpp=31.2),
+    pv.TemperatureCoefficients(cIsc=0.05, cVoc=-0.29, cPmpp=-0.4),
+    noct=48.0
+)
+pv_char.enable_cache(maxsize=64, G_step=1.0, Tc_step=0.1)
+
+matrices = []
+for name, azimuth in (('PVM_EAST', 78.0), ('PVM_WEST', 258.0)):
+    solar_panel = pv.SolarPanel(
+        loc=loc,
+        orient=pv.Orientation(azimuth=azimuth, tilt=20.0),
+        dim=pv.Dimensions(width=0.99, height=1.66),
+        pv_char=pv_char
+    )
+    matrix = pv.SolarPanelMatrix(name, row_num=9, col_num=1)
+    matrix.add_solar_panels(solar_panel)
+    matrices.append(matrix)
+
+inverter = pv.Inverter('INVERTER')
+inverter.setup(
+    Pac_nom=5000.0,
+    Vdc_nom=360.0,
+    Vdc_max=600.0,
+    Vmpp_min=175.0,
+    Vmpp_max=480.0,
+    Idc_max=15.0,
+    Pdc_max=5200.0,
+    eff_max=97.5,
+    eff_avg=96.5
+)
+for matrix in matrices:
+    inverter.add_pv_matrix(matrix)
+
+for i in range(3):
+    warnings = inverter.check()
+    requirements = inverter.get_requirements()
+    print(f'run {i + 1}: {pv_char.cache_info()}')
+print(f'warnings: {warnings}')
+for name, (value, unit) in requirements.items():
+    print(f'{name} = {value:.1f} {unit}')
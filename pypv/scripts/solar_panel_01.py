@@ -33,21 +33,22 @@ solar_noon = sun.SunPositionCalculator.solar_noon(loc, date)
 sun_pos = sun.SunPositionCalculator.calculate_position(loc, date, solar_noon)
 print(solar_noon, sun_pos)
 
-# Calculate MPP powers for three different azimuth angles of the solar panel and tilt angles between 0° and 45°
+# Calculate MPP powers for three different azimuth angles of the solar panel and tilt angles between 0° and 45°: the
+# whole grid of orientations is evaluated at once; with a time step of 1 hour the MPP energy [kWh] of a single instant
+# equals the MPP power [kW]
 azimuths = [90.0, 180.0, 270.0]
 tilts = np.linspace(0.0, 45.0)
-Pmpp = [[] for _ in azimuths]
-for i, azimuth in enumerate(azimuths):
-    for tilt in tilts:
-        solar_panel = pv.SolarPanel(
-            loc=loc,
-            orient=pv.Orientation(azimuth=azimuth, tilt=tilt),
-            dim=pv.Dimensions(width=0.99, height=1.66),
-            pv_char=pv_char,
-            hz_profile=None
-        )
-        solar_panel.set_operating_conditions(date=date, time=solar_noon, Gglh=1000.0, Tambient=25.0)
-        Pmpp[i].append(solar_panel.get_mpp_power())
+grid = pv.evaluate_orientation_grid(
+    loc=loc,
+    pv_char=pv_char,
+    azimuths=np.array(azimuths),
+    tilts=tilts,
+    datetimes=np.array([date_time.DateTime(date=date, time=solar_noon).py_datetime], dtype='datetime64[s]'),
+    Gglh=np.array([1000.0]),
+    Tamb=np.array([25.0]),
+    time_step=1.0
+)
+Pmpp = grid['Empp'] * 1000.0
 
 # Show the results in diagram
 graph = graphing.Graph()
@@ -0,0 +1,55 @@
+# Benchmark of the precision tiers of SunPositionCalculator: throughput of each tier on a whole year at a 1-minute time
+# step, and the maximum angular deviation of each tier from the full precision NOAA algorithm (sun above the horizon).
+
+import time as timer
+
+import numpy as np
+
+from sun.geometry import Location, SunPositionCalculator
+from quantities.date_time import Date, Time, ANY_YEAR
+
+loc = Location(
+    name='Ghent',
+    region='Belgium',
+    latitude=51.07,
+    longitude=3.69,
+    timezone='Europe/Brussels',
+    altitude=9.0
+)
+
+timestamps = np.arange(
+    np.datetime64(f'{ANY_YEAR}-01-01T00:00:00'),
+    np.datetime64(f'{ANY_YEAR + 1}-01-01T00:00:00'),
+    np.timedelta64(1, 'm')
+)
+
+
+def angular_deviation(positions, ref_positions):
+    # angle [°] between the directions of the sun in 'positions' and in 'ref_positions'
+    azi, elev = np.radians(positions['azimuth']), np.radians(positions['elevation'])
+    ref_azi, ref_elev = np.radians(ref_positions['azimuth']), np.radians(ref_positions['elevation'])
+    cos_dev = np.sin(elev) * np.sin(ref_elev) + np.cos(elev) * np.cos(ref_elev) * np.cos(azi - ref_azi)
+    return np.degrees(np.arccos(np.clip(cos_dev, -1.0, 1.0)))
+
+
+ref_positions = SunPositionCalculator.calculate_positions(loc, timestamps, precision='noaa')
+above_horizon = ref_positions['elevation'] > 0.0
+
+print(f"{len(timestamps)} sun positions")
+for precision in SunPositionCalculator.PRECISIONS:
+    t_start = timer.perf_counter()
+    positions = SunPositionCalculator.calculate_positions(loc, timestamps, precision=precision)
+    t_tier = timer.perf_counter() - t_start
+    deviation = angular_deviation(positions, ref_positions)[above_horizon].max()
+    print(
+        f"{precision:<10}: {t_tier * 1000.0:7.1f} ms | {len(timestamps) / t_tier / 1.0e6:5.2f} million positions/s | "
+        f"max. deviation {deviation:.4f}°"
+    )
+
+# astral itself, one position at a time (measured on the first day and extrapolated to the whole year)
+t_start = timer.perf_counter()
+for py_datetime in timestamps[:1440].tolist():
+    date, time = Date.from_py_datetime(py_datetime), Time.from_py_datetime(py_datetime)
+    SunPositionCalculator.calculate_position(loc, date, time)
+t_astral = (timer.perf_counter() - t_start) * len(timestamps) / 1440
+print(f"astral (scalar, estimated): {t_astral * 1000.0:.1f} ms | {len(timestamps) / t_astral:.0f} positions/s")
@@ -0,0 +1,49 @@
+# Compare the sun positions calculated with SunPositionCalculator.calculate_positions(...) (NOAA in NumPy) to the ones
+# calculated with SunPositionCalculator.calculate_position(...) (astral) for every hour of a whole year. The script
+# fails if the deviation exceeds TOLERANCE.
+
+import time as timer
+
+import numpy as np
+
+from sun.geometry import Location, SunPositionCalculator
+from quantities.date_time import Date, Time, ANY_YEAR
+
+loc = Location(
+    name='Ghent',
+    region='Belgium',
+    latitude=51.07,
+    longitude=3.69,
+    timezone='Europe/Brussels',
+    altitude=9.0
+)
+
+TOLERANCE = 1.0e-6  # max. deviation [°] of azimuth and elevation from the astral path
+
+timestamps = np.arange(
+    np.datetime64(f'{ANY_YEAR}-01-01T00:00:00'),
+    np.datetime64(f'{ANY_YEAR + 1}-01-01T00:00:00'),
+    np.timedelta64(1, 'h')
+)
+
+t_start = timer.perf_counter()
+positions = SunPositionCalculator.calculate_positions(loc, timestamps)
+t_array = timer.perf_counter() - t_start
+
+t_start = timer.perf_counter()
+azimuth = []; elevation = []
+for py_datetime in timestamps.tolist():
+    date, time = Date.from_py_datetime(py_datetime), Time.from_py_datetime(py_datetime)
+    sp = SunPositionCalculator.calculate_position(loc, date, time)
+    azimuth.append(sp.azimuth('deg'))
+    elevation.append(sp.elevation('deg'))
+t_astral = timer.perf_counter() - t_start
+
+d_azimuth = np.abs((positions['azimuth'] - np.array(azimuth) + 180.0) % 360.0 - 180.0)
+d_elevation = np.abs(positions['elevation'] - np.array(elevation))
+print(f"{len(timestamps)} sun positions")
+print(f"calculate_positions: {t_array * 1000.0:.1f} ms | calculate_position: {t_astral * 1000.0:.1f} ms")
+print(f"max. deviation azimuth: {d_azimuth.max():.3e}° | max. deviation elevation: {d_elevation.max():.3e}°")
+
+if d_azimuth.max() > TOLERANCE or d_elevation.max() > TOLERANCE:
+    raise AssertionError(f"deviation from astral exceeds the tolerance of {TOLERANCE:.0e}°")